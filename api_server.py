@@ -291,6 +291,8 @@ if __name__ == "__main__":
     print("📍 API will be available at: http://localhost:8004")
     print("📖 API documentation at: http://localhost:8004/docs")
 
+    from utility.ready_signal import notify_ready_when_listening
+    notify_ready_when_listening(8005)
     uvicorn.run(
         "api_server:app",
         host="0.0.0.0",
@@ -1101,4 +1101,9 @@ def _process_single_file_for_ingestion(file_path: str, company_name: Optional[st
 
 
 if __name__ == "__main__":
+    import sys
+    sys.path.append(str(Path(__file__).parent.parent))
+    from utility.ready_signal import notify_ready_when_listening
+    
+    notify_ready_when_listening(8001)
     mcp.run(transport='streamable-http', port=8001)
\ No newline at end of file
@@ -2,6 +2,7 @@ from langchain_openai import OpenAIEmbeddings
 from qdrant_client import QdrantClient
 from qdrant_client.models import Distance, VectorParams
 from dotenv import load_dotenv
+from utility import ingest_cache
 
 load_dotenv()
 
@@ -24,6 +25,10 @@ def create_qdrant_collection(collection_name: str, qdrant_url: str = "http://loc
     )
     
     print(f" Collection '{collection_name}' recreated with vector size {embedding_dim}.")
+    
+    # Files recorded as ingested into the old collection must be ingested again
+    removed = ingest_cache.forget_collection(collection_name)
+    print(f" Cleared {removed} ingest cache entries for '{collection_name}'.")
 
 if __name__ == "__main__":
     # Recreate both collections fresh
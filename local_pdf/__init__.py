@@ -10,13 +10,19 @@ from .local_pdf_agent import create_local_pdf_agent
 
 # Utilities
 from .utils import (
+    iter_pdfs,
+    iter_pdf_file_info,
     list_pdfs_in_directory,
     read_pdf_content,
+    read_pdf_content_cached,
+    iter_pdf_pages,
     get_pdf_metadata,
+    PdfHandle,
     copy_pdf_file,
     move_pdf_file,
     delete_pdf_file,
     ingest_pdfs_to_rag,
+    ingest_pdfs_to_rag_sync,
     search_pdf_content,
     test_local_pdf_access
 )
@@ -29,13 +35,19 @@ __all__ = [
     'create_local_pdf_agent',
     
     # Utilities
+    'iter_pdfs',
+    'iter_pdf_file_info',
     'list_pdfs_in_directory',
     'read_pdf_content',
+    'read_pdf_content_cached',
+    'iter_pdf_pages',
     'get_pdf_metadata',
+    'PdfHandle',
     'copy_pdf_file',
     'move_pdf_file',
     'delete_pdf_file',
     'ingest_pdfs_to_rag',
+    'ingest_pdfs_to_rag_sync',
     'search_pdf_content',
     'test_local_pdf_access',
 ]
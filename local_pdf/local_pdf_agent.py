@@ -4,7 +4,12 @@ Uses LangGraph's create_react_agent with MCP tools via streamable HTTP
 Intelligently selects from 8 Local PDF MCP tools based on user prompts
 """
 import asyncio
+import time
+import weakref
 import aiohttp
+import httpx
+from contextlib import AsyncExitStack
+from typing import Optional
 from langchain_openai import ChatOpenAI
 from langchain_mcp_adapters.tools import load_mcp_tools
 from langgraph.prebuilt import create_react_agent
@@ -13,37 +18,55 @@ from mcp.client.streamable_http import streamablehttp_client
 from dotenv import load_dotenv
 import os
 
+from utility.http_client import get_http_client
+
 load_dotenv()
 
 
+# Chat models per event loop, since each holds that loop's HTTP client
+_chat_models: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ChatOpenAI]" = weakref.WeakKeyDictionary()
+
+
+def get_chat_model() -> ChatOpenAI:
+    """Get the shared chat model (built once per event loop, reused by every agent created there)."""
+    loop = asyncio.get_running_loop()
+    model = _chat_models.get(loop)
+    if model is None:
+        model = _chat_models[loop] = ChatOpenAI(
+            model=os.getenv("OPENAI_MODEL", "gpt-4.1-nano"),
+            temperature=0,
+            http_async_client=get_http_client()
+        )
+    return model
+
+
 async def wait_for_server(url: str, timeout: int = 10):
-    """Wait until the MCP server is ready to accept connections."""
-    import time
-    import socket
-    from urllib.parse import urlparse
-    
-    parsed = urlparse(url)
-    host = parsed.hostname or 'localhost'
-    port = parsed.port
-    
-    start = time.time()
-    while time.time() - start < timeout:
+    """Wait until the MCP server is ready to answer HTTP requests."""
+    client = get_http_client()
+    backoff = 0.05
+    start = time.monotonic()
+    while time.monotonic() - start < timeout:
         try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result = sock.connect_ex((host, port))
-            sock.close()
-            if result == 0:
+            response = await client.get(url, timeout=1.0)
+            # Any non-5xx answer means the HTTP app is up (MCP rejects bare GETs with 4xx)
+            if response.status_code < 500:
                 print(f"✅ Local PDF MCP server is up at {url}")
                 return True
-        except:
+        except httpx.TransportError:
             pass
-        await asyncio.sleep(1)
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, 1.0)
     raise TimeoutError(f"Local PDF MCP server at {url} did not respond within {timeout} seconds")
 
 
-async def create_local_pdf_agent():
-    """Create the Local PDF sub-agent with all MCP tools."""
+async def create_local_pdf_agent(stack: Optional[AsyncExitStack] = None):
+    """
+    Create the Local PDF sub-agent with all MCP tools.
+    
+    The MCP client and session are entered on `stack`, so closing the stack
+    tears them down in order (session first, then client). If no stack is
+    given, one is created and kept on the agent as `_mcp_stack`.
+    """
     system_prompt = """
     You are a specialized Local PDF Operations Agent with comprehensive access to local PDF file management and document operations.
     
@@ -99,14 +122,15 @@ async def create_local_pdf_agent():
     Respond professionally and provide detailed information about operations performed.
     """
     
-    model = ChatOpenAI(model="gpt-4o", temperature=0)
+    model = get_chat_model()
     MCP_HTTP_STREAM_URL = "http://localhost:8003/mcp"
     
-    # Keep the client and session open for the lifetime of the agent
+    # Keep the client and session open for the lifetime of the stack
+    if stack is None:
+        stack = AsyncExitStack()
     client = streamablehttp_client(MCP_HTTP_STREAM_URL)
-    read_stream, write_stream, _ = await client.__aenter__()
-    session = ClientSession(read_stream, write_stream)
-    await session.__aenter__()
+    read_stream, write_stream, _ = await stack.enter_async_context(client)
+    session = await stack.enter_async_context(ClientSession(read_stream, write_stream))
     await session.initialize()
     tools = await load_mcp_tools(session)
     
@@ -117,9 +141,10 @@ async def create_local_pdf_agent():
         prompt=system_prompt
     )
     
-    # Attach the session and client to the agent to keep them alive
+    # Attach the session, client and their exit stack to the agent to keep them alive
     agent._mcp_session = session
     agent._mcp_client = client
+    agent._mcp_stack = stack
     
     return agent
 
@@ -134,15 +159,15 @@ if __name__ == "__main__":
         print("Local PDF Intelligent Agent - Demo")
         print("="*70 + "\n")
         
-        # Create the agent
-        agent = await create_local_pdf_agent()
-        
-        # Example queries
-        queries = [
-            "ingest /Users/I8798/Desktop/Data_Sources_MCP/10k_PDFs/AMAZON.pdf",
-        ]
-        
-        try:
+        async with AsyncExitStack() as stack:
+            # Create the agent (its MCP session and client close with the stack)
+            agent = await create_local_pdf_agent(stack)
+            
+            # Example queries
+            queries = [
+                "ingest /Users/I8798/Desktop/Data_Sources_MCP/10k_PDFs/AMAZON.pdf",
+            ]
+            
             for i, query in enumerate(queries, 1):
                 print(f"\n{'─'*70}")
                 print(f"Query {i}: {query}")
@@ -159,19 +184,5 @@ if __name__ == "__main__":
             print("\n" + "="*70)
             print("Demo Complete!")
             print("="*70 + "\n")
-        
-        finally:
-            # Properly close the MCP session and client
-            if hasattr(agent, '_mcp_session'):
-                try:
-                    await agent._mcp_session.__aexit__(None, None, None)
-                except:
-                    pass
-            
-            if hasattr(agent, '_mcp_client'):
-                try:
-                    await agent._mcp_client.__aexit__(None, None, None)
-                except:
-                    pass
     
     asyncio.run(main())
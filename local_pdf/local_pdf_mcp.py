@@ -1,22 +1,36 @@
 """
 Local PDF MCP Server
-Provides 8 MCP tools for local PDF file management and RAG ingestion
+Provides 9 MCP tools for local PDF file management and RAG ingestion
 """
 import os
+import re
 import json
 import shutil
+import asyncio
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-from fastmcp import FastMCP
+from fastmcp import FastMCP, Context
 import sys
 
-if __name__ == "__main__":
-    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# Make the repo root importable once (needed when run as a script)
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
 
 # Import utilities
 from local_pdf.utils import (
+    iter_pdfs,
     list_pdfs_in_directory,
-    read_pdf_content,
+    read_pdf_content_cached,
     get_pdf_metadata,
     copy_pdf_file,
     move_pdf_file,
@@ -24,10 +38,56 @@ from local_pdf.utils import (
     ingest_pdfs_to_rag,
     search_pdf_content
 )
+from utility import ingest_cache
+from utility.pdf_processor1 import process_pdf_and_stream
 
 # Initialize FastMCP server
 mcp = FastMCP("Local PDF Manager")
 
+# Bounds the number of in-flight PDF reads (and open file handles) across tools
+_PDF_SEM = asyncio.Semaphore(os.cpu_count() or 1)
+
+# Upper bound on the number of files returned by one list_local_pdfs call
+MAX_LIST_PAGE_SIZE = 1000
+
+# Default number of PDFs ingested in parallel by the ingest tools
+DEFAULT_INGEST_CONCURRENCY = 6
+
+# Per-file ingestion runs in these processes: the pipeline parses with MuPDF,
+# which is not thread-safe, so files are never processed on server threads
+_ingest_pool = None
+
+# Classifies streamed ingestion messages as success ("ok") or failure ("bad")
+_STATUS_RE = re.compile(r"(?P<ok>Added\b.*\bchunks|already ingested)|(?P<bad>Error|Failed)", re.I)
+
+
+def _get_ingest_pool() -> ProcessPoolExecutor:
+    """Get the process pool that runs _ingest_pdf_file (created on first use)."""
+    global _ingest_pool
+    if _ingest_pool is None:
+        # Spawned rather than forked: the server process already runs the event
+        # loop, HTTP clients and helper threads, none of which survive a fork
+        _ingest_pool = ProcessPoolExecutor(
+            max_workers=max(os.cpu_count() or 1, DEFAULT_INGEST_CONCURRENCY),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _ingest_pool
+
+
+def _discard_ingest_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken ingest pool (e.g. a worker was OOM-killed) so the next file gets a new one."""
+    global _ingest_pool
+    if _ingest_pool is pool:
+        _ingest_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _json(obj: Any, indent: bool = True) -> str:
+    """Serialize a tool response to a JSON string (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(obj, indent=2 if indent else None)
+
 
 # ============================================================================
 # MCP TOOL 1: LIST LOCAL PDFs
@@ -36,33 +96,46 @@ mcp = FastMCP("Local PDF Manager")
 @mcp.tool()
 def list_local_pdfs(
     directory_path: str,
-    recursive: bool = False
+    recursive: bool = False,
+    offset: int = 0,
+    limit: int = MAX_LIST_PAGE_SIZE
 ) -> str:
     """
-    List all PDF files in a local directory.
+    List PDF files in a local directory, one page at a time.
     
     Args:
         directory_path: Absolute path to the directory
         recursive: Whether to search subdirectories
+        offset: Number of PDFs to skip (for paging through large directories)
+        limit: Maximum number of PDFs to return (at most 1000)
         
     Returns:
-        JSON string with list of PDF files
+        JSON string with list of PDF files; "has_more" is true when another
+        page is available at offset + limit
     """
     try:
-        pdf_files = list_pdfs_in_directory(directory_path, recursive)
-        
-        return json.dumps({
+        limit = max(1, min(limit, MAX_LIST_PAGE_SIZE))
+        # Fetch one extra entry to know whether another page exists
+        pdf_files = list_pdfs_in_directory(directory_path, recursive, offset, limit + 1)
+        has_more = len(pdf_files) > limit
+        del pdf_files[limit:]
+        
+        # Listings can be large and are machine-consumed, so skip indentation
+        return _json({
             "success": True,
             "directory": directory_path,
             "pdf_count": len(pdf_files),
+            "offset": offset,
+            "limit": limit,
+            "has_more": has_more,
             "files": pdf_files
-        }, indent=2)
+        }, indent=False)
         
     except Exception as e:
-        return json.dumps({
+        return _json({
             "success": False,
             "error": str(e)
-        })
+        }, indent=False)
 
 
 # ============================================================================
@@ -70,7 +143,7 @@ def list_local_pdfs(
 # ============================================================================
 
 @mcp.tool()
-def read_local_pdf(
+async def read_local_pdf(
     file_path: str,
     max_pages: int = 10
 ) -> str:
@@ -85,31 +158,271 @@ def read_local_pdf(
         JSON string with PDF content
     """
     try:
-        content = read_pdf_content(file_path, max_pages)
+        # read_pdf_content fans pages out to its own worker processes, so it is
+        # driven from a thread here; repeat reads of an unchanged file are
+        # served from the text cache
+        async with _PDF_SEM:
+            content, pages_read = await asyncio.to_thread(read_pdf_content_cached, file_path, max_pages)
         
-        return json.dumps({
+        return _json({
             "success": True,
             "file_path": file_path,
             "content": content,
-            "pages_read": min(max_pages, content.count('\n\n') + 1)
-        }, indent=2)
+            "pages_read": pages_read
+        })
         
     except Exception as e:
-        return json.dumps({
+        return _json({
             "success": False,
             "error": str(e)
-        })
+        }, indent=False)
 
 
 # ============================================================================
 # MCP TOOL 3: INGEST LOCAL PDFs 
 # ============================================================================
 
+def _collect_pdf_files(
+    file_paths: Optional[List[str]],
+    directory_path: Optional[str],
+    recursive: bool
+) -> list:
+    """Resolve the tool arguments into (path, stat) pairs for the PDF files to ingest."""
+    pdf_files_to_ingest = []
+    
+    if file_paths:
+        # Use specific file paths
+        print(f"📋 Processing {len(file_paths)} specific file(s)...")
+        for file_path in file_paths:
+            try:
+                st = os.stat(file_path)
+            except FileNotFoundError:
+                print(f"   ⚠️  File not found: {file_path}")
+                continue
+            if not file_path.lower().endswith('.pdf'):
+                print(f"   ⚠️  Skipping {os.path.basename(file_path)} - Not a PDF file")
+                continue
+            pdf_path = Path(file_path)
+            pdf_files_to_ingest.append((pdf_path, st))
+            print(f"   ✅ Added: {pdf_path.name}")
+            
+    elif directory_path:
+        # Scan directory for PDFs
+        dir_path = Path(directory_path)
+        if not dir_path.exists():
+            raise ValueError(f"Directory not found: {directory_path}")
+        
+        print(f"📁 Scanning directory: {directory_path}")
+        print(f"   Recursive: {recursive}")
+        
+        pdf_files_to_ingest = [(Path(entry.path), entry.stat()) for entry in iter_pdfs(dir_path, recursive)]
+        
+        print(f"   ✅ Found {len(pdf_files_to_ingest)} PDF file(s)")
+        
+    else:
+        raise ValueError("Either 'file_paths' or 'directory_path' must be provided")
+    
+    return pdf_files_to_ingest
+
+
+def _pdf_files_or_error(
+    file_paths: Optional[List[str]],
+    directory_path: Optional[str],
+    recursive: bool
+) -> tuple:
+    """
+    Validate the ingest tool arguments and collect the PDFs to ingest.
+    
+    Returns:
+        (pdf_files, None), or (None, error response JSON) when there is nothing to ingest
+    """
+    try:
+        pdf_files_to_ingest = _collect_pdf_files(file_paths, directory_path, recursive)
+    except ValueError as e:
+        return None, _json({
+            "success": False,
+            "error": str(e)
+        }, indent=False)
+    
+    if not pdf_files_to_ingest:
+        return None, _json({
+            "success": False,
+            "error": "No PDF files found to ingest",
+            "files_ingested": 0
+        }, indent=False)
+    
+    return pdf_files_to_ingest, None
+
+
+def _ingest_pdf_file(pdf_path: Path, st: os.stat_result) -> tuple:
+    """
+    Run a single PDF through the ingestion pipeline.
+    
+    st is the stat taken when the file was collected, reused for the size and cache key.
+    
+    Returns:
+        (success, record) where record is the per-file result entry
+    """
+    try:
+        print(f"\n📄 Processing: {pdf_path.name}")
+        print(f"   Size: {st.st_size:,} bytes")
+        
+        # Skip files whose exact bytes were already ingested
+        if ingest_cache.seen(pdf_path, st):
+            print(f"   ⏭️  Already ingested (cached): {pdf_path.name}")
+            return True, {
+                'file': pdf_path.name,
+                'path': os.fspath(pdf_path),
+                'size_bytes': st.st_size,
+                'status': 'skipped_cached'
+            }
+        
+        processing_successful = False
+        processing_messages = deque(maxlen=3)  # Keep only the last 3 messages
+        
+        # Process PDF with streaming output
+        for message in process_pdf_and_stream(os.fspath(pdf_path)):
+            processing_messages.append(message)
+            print(f"   {message}")
+            
+            # Check for success/failure indicators
+            status = _STATUS_RE.search(message)
+            if status is None:
+                continue
+            if status.group("ok"):
+                processing_successful = True
+            else:
+                processing_successful = False
+                break
+        
+        if processing_successful:
+            ingest_cache.mark(pdf_path, st=st)
+            print(f"   ✅ Successfully ingested: {pdf_path.name}")
+            return True, {
+                'file': pdf_path.name,
+                'path': os.fspath(pdf_path),
+                'size_bytes': st.st_size,
+                'status': 'ingested',
+                'messages': list(processing_messages)
+            }
+        
+        print(f"   ❌ Failed to ingest: {pdf_path.name}")
+        return False, {
+            'file': pdf_path.name,
+            'path': os.fspath(pdf_path),
+            'error': 'PDF processing failed',
+            'messages': list(processing_messages)
+        }
+            
+    except Exception as e:
+        print(f"   ❌ Exception: {str(e)}")
+        return False, {
+            'file': pdf_path.name,
+            'path': os.fspath(pdf_path),
+            'error': str(e)
+        }
+
+
+async def _ingest_concurrently(
+    pdf_files_to_ingest: list,
+    concurrency: int = DEFAULT_INGEST_CONCURRENCY,
+    on_result=None
+) -> list:
+    """
+    Ingest PDFs with a queue feeding `concurrency` worker tasks.
+    
+    Each file runs in the ingest process pool, so parsing, embedding calls and
+    Qdrant writes for different files overlap. `on_result`, if given, is awaited with
+    (success, record) as each file finishes. A file whose worker raised is
+    reported as a failure rather than dropped.
+    
+    Returns:
+        List of (success, record) tuples in input order
+    """
+    queue = asyncio.Queue()
+    for item in enumerate(pdf_files_to_ingest):
+        queue.put_nowait(item)
+    results = [None] * len(pdf_files_to_ingest)
+    
+    loop = asyncio.get_running_loop()
+    
+    async def worker():
+        while True:
+            index, (pdf_path, st) = await queue.get()
+            try:
+                ingest_pool = _get_ingest_pool()
+                try:
+                    results[index] = await loop.run_in_executor(ingest_pool, _ingest_pdf_file, pdf_path, st)
+                except Exception as e:
+                    if isinstance(e, BrokenProcessPool):
+                        _discard_ingest_pool(ingest_pool)
+                    print(f"   ⚠️  Ingest worker error on {pdf_path.name}: {str(e)}")
+                    results[index] = False, {
+                        'file': pdf_path.name,
+                        'path': os.fspath(pdf_path),
+                        'error': str(e)
+                    }
+                if on_result is not None:
+                    try:
+                        await on_result(results[index])
+                    except Exception as e:
+                        print(f"   ⚠️  Could not report result for {pdf_path.name}: {str(e)}")
+            finally:
+                queue.task_done()
+    
+    num_workers = max(1, min(concurrency, len(pdf_files_to_ingest)))
+    workers = [asyncio.create_task(worker()) for _ in range(num_workers)]
+    try:
+        await queue.join()
+    finally:
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+    
+    return results
+
+
+def _ingestion_summary(total_files: int, processed_files: list, failed_files: list) -> Dict[str, Any]:
+    """Print the ingestion summary and build the tool response payload."""
+    print(f"\n{'='*70}")
+    print(f"📊 INGESTION SUMMARY")
+    print(f"{'='*70}")
+    print(f"✅ Successfully ingested: {len(processed_files)}")
+    print(f"❌ Failed: {len(failed_files)}")
+    print(f"📁 Total processed: {total_files}")
+    print(f"{'='*70}\n")
+    
+    return {
+        "success": True,
+        "total_files": total_files,
+        "ingested": len(processed_files),
+        "failed": len(failed_files),
+        "processed_files": processed_files,
+        "failed_files": failed_files,
+        "message": f"Successfully ingested {len(processed_files)} of {total_files} PDF file(s)"
+    }
+
+
+def _ingestion_error(e: Exception) -> str:
+    """Build the error response for an unexpected ingestion failure."""
+    import traceback
+    error_trace = traceback.format_exc()
+    print(f"\n❌ Exception in ingest_local_pdfs: {str(e)}")
+    print(f"Traceback:\n{error_trace}")
+    
+    return _json({
+        "success": False,
+        "error": f"Ingestion failed: {str(e)}",
+        "traceback": error_trace
+    }, indent=False)
+
+
 @mcp.tool()
-def ingest_local_pdfs(
+async def ingest_local_pdfs(
     file_paths: Optional[List[str]] = None,
     directory_path: Optional[str] = None,
-    recursive: bool = False
+    recursive: bool = False,
+    concurrency: int = DEFAULT_INGEST_CONCURRENCY
 ) -> str:
     """
     Ingest local PDFs into the vector database (RAG system).
@@ -124,6 +437,7 @@ def ingest_local_pdfs(
         file_paths: List of absolute paths to specific PDF files to ingest (optional)
         directory_path: Absolute path to directory containing PDFs (optional)
         recursive: Whether to search subdirectories (only used with directory_path)
+        concurrency: Number of PDFs ingested in parallel (default: 6)
         
     Returns:
         JSON string with ingestion results
@@ -136,61 +450,17 @@ def ingest_local_pdfs(
         ingest_local_pdfs(directory_path="/path/to/pdfs", recursive=True)
     """
     try:
-        import sys
-        from pathlib import Path
-        
         print(f"\n{'='*70}")
         print(f"🚀 Local PDF Ingestion Pipeline Started")
         print(f"{'='*70}")
         
         # Collect PDF files to process
-        pdf_files_to_ingest = []
-        
-        if file_paths:
-            # Use specific file paths
-            print(f"📋 Processing {len(file_paths)} specific file(s)...")
-            for file_path in file_paths:
-                pdf_path = Path(file_path)
-                if not pdf_path.exists():
-                    print(f"   ⚠️  File not found: {file_path}")
-                    continue
-                if not pdf_path.suffix.lower() == '.pdf':
-                    print(f"   ⚠️  Skipping {pdf_path.name} - Not a PDF file")
-                    continue
-                pdf_files_to_ingest.append(pdf_path)
-                print(f"   ✅ Added: {pdf_path.name}")
-                
-        elif directory_path:
-            # Scan directory for PDFs
-            dir_path = Path(directory_path)
-            if not dir_path.exists():
-                return json.dumps({
-                    "success": False,
-                    "error": f"Directory not found: {directory_path}"
-                })
-            
-            print(f"📁 Scanning directory: {directory_path}")
-            print(f"   Recursive: {recursive}")
-            
-            if recursive:
-                pdf_files_to_ingest = list(dir_path.rglob("*.pdf"))
-            else:
-                pdf_files_to_ingest = list(dir_path.glob("*.pdf"))
-            
-            print(f"   ✅ Found {len(pdf_files_to_ingest)} PDF file(s)")
-            
-        else:
-            return json.dumps({
-                "success": False,
-                "error": "Either 'file_paths' or 'directory_path' must be provided"
-            })
-        
-        if not pdf_files_to_ingest:
-            return json.dumps({
-                "success": False,
-                "error": "No PDF files found to ingest",
-                "files_ingested": 0
-            })
+        # A recursive scan of a large tree would otherwise stall every other tool
+        pdf_files_to_ingest, error = await asyncio.to_thread(
+            _pdf_files_or_error, file_paths, directory_path, recursive
+        )
+        if error:
+            return error
         
         # Step 1: Ingest files using pdf_processor1
         print(f"\n{'─'*70}")
@@ -200,92 +470,67 @@ def ingest_local_pdfs(
         processed_files = []
         failed_files = []
         
-        # Import PDF processor (add paths for dependencies)
-        parent_dir = os.path.join(os.path.dirname(__file__), '..')
-        sys.path.insert(0, parent_dir)
-        sys.path.insert(0, os.path.join(parent_dir, 'load_vector_dbs'))
-        sys.path.insert(0, os.path.join(parent_dir, 'data_preparation'))
+        for success, record in await _ingest_concurrently(pdf_files_to_ingest, concurrency):
+            (processed_files if success else failed_files).append(record)
         
-        from utility.pdf_processor1 import process_pdf_and_stream
+        return _json(_ingestion_summary(len(pdf_files_to_ingest), processed_files, failed_files))
         
-        for pdf_path in pdf_files_to_ingest:
-            try:
-                print(f"\n📄 Processing: {pdf_path.name}")
-                print(f"   Size: {pdf_path.stat().st_size:,} bytes")
-                
-                processing_successful = False
-                processing_messages = []
-                
-                # Process PDF with streaming output
-                for message in process_pdf_and_stream(str(pdf_path)):
-                    processing_messages.append(message)
-                    print(f"   {message}")
-                    
-                    # Check for success indicators
-                    if "Added" in message and "chunks" in message:
-                        processing_successful = True
-                    elif "already ingested" in message.lower():
-                        processing_successful = True
-                    elif "Error" in message or "Failed" in message:
-                        processing_successful = False
-                        break
-                
-                if processing_successful:
-                    processed_files.append({
-                        'file': pdf_path.name,
-                        'path': str(pdf_path),
-                        'size_bytes': pdf_path.stat().st_size,
-                        'status': 'ingested',
-                        'messages': processing_messages[-3:]  # Last 3 messages
-                    })
-                    print(f"   ✅ Successfully ingested: {pdf_path.name}")
-                else:
-                    failed_files.append({
-                        'file': pdf_path.name,
-                        'path': str(pdf_path),
-                        'error': 'PDF processing failed',
-                        'messages': processing_messages[-3:]
-                    })
-                    print(f"   ❌ Failed to ingest: {pdf_path.name}")
-                    
-            except Exception as e:
-                failed_files.append({
-                    'file': pdf_path.name,
-                    'path': str(pdf_path),
-                    'error': str(e)
-                })
-                print(f"   ❌ Exception: {str(e)}")
-        
-        # Final summary
-        print(f"\n{'='*70}")
-        print(f"📊 INGESTION SUMMARY")
-        print(f"{'='*70}")
-        print(f"✅ Successfully ingested: {len(processed_files)}")
-        print(f"❌ Failed: {len(failed_files)}")
-        print(f"📁 Total processed: {len(pdf_files_to_ingest)}")
-        print(f"{'='*70}\n")
+    except Exception as e:
+        return _ingestion_error(e)
+
+
+@mcp.tool()
+async def ingest_local_pdfs_stream(
+    ctx: Context,
+    file_paths: Optional[List[str]] = None,
+    directory_path: Optional[str] = None,
+    recursive: bool = False,
+    concurrency: int = DEFAULT_INGEST_CONCURRENCY
+) -> str:
+    """
+    Ingest local PDFs into the vector database, reporting progress per file.
+    
+    Same inputs and final result as ingest_local_pdfs, but each file's status
+    is sent to the client as a log message ({"file": ..., "status": ...}) and
+    a progress notification as soon as that file finishes.
+    
+    Args:
+        file_paths: List of absolute paths to specific PDF files to ingest (optional)
+        directory_path: Absolute path to directory containing PDFs (optional)
+        recursive: Whether to search subdirectories (only used with directory_path)
+        concurrency: Number of PDFs ingested in parallel (default: 6)
         
-        return json.dumps({
-            "success": True,
-            "total_files": len(pdf_files_to_ingest),
-            "ingested": len(processed_files),
-            "failed": len(failed_files),
-            "processed_files": processed_files,
-            "failed_files": failed_files,
-            "message": f"Successfully ingested {len(processed_files)} of {len(pdf_files_to_ingest)} PDF file(s)"
-        }, indent=2)
+    Returns:
+        JSON string with ingestion results
+    """
+    try:
+        # A recursive scan of a large tree would otherwise stall every other tool
+        pdf_files_to_ingest, error = await asyncio.to_thread(
+            _pdf_files_or_error, file_paths, directory_path, recursive
+        )
+        if error:
+            return error
+        
+        total = len(pdf_files_to_ingest)
+        processed_files = []
+        failed_files = []
         
-    except Exception as e:
-        import traceback
-        error_trace = traceback.format_exc()
-        print(f"\n❌ Exception in ingest_local_pdfs: {str(e)}")
-        print(f"Traceback:\n{error_trace}")
+        async def report(result):
+            success, record = result
+            (processed_files if success else failed_files).append(record)
+            
+            await ctx.info(_json({
+                "file": record['file'],
+                "status": record.get('status', 'failed')
+            }, indent=False))
+            await ctx.report_progress(len(processed_files) + len(failed_files), total)
         
-        return json.dumps({
-            "success": False,
-            "error": f"Ingestion failed: {str(e)}",
-            "traceback": error_trace
-        })
+        await _ingest_concurrently(pdf_files_to_ingest, concurrency, on_result=report)
+        
+        return _json(_ingestion_summary(total, processed_files, failed_files))
+        
+    except Exception as e:
+        return _ingestion_error(e)
 
 
 # ============================================================================
@@ -312,19 +557,19 @@ def search_local_pdfs(
     try:
         results = search_pdf_content(query, collection_name, top_k)
         
-        return json.dumps({
+        return _json({
             "success": True,
             "query": query,
             "collection": collection_name,
             "results_count": len(results),
             "results": results
-        }, indent=2)
+        })
         
     except Exception as e:
-        return json.dumps({
+        return _json({
             "success": False,
             "error": str(e)
-        })
+        }, indent=False)
 
 
 # ============================================================================
@@ -332,7 +577,7 @@ def search_local_pdfs(
 # ============================================================================
 
 @mcp.tool()
-def get_local_pdf_metadata(file_path: str) -> str:
+async def get_local_pdf_metadata(file_path: str) -> str:
     """
     Get metadata (size, pages, etc.) of a local PDF.
     
@@ -343,19 +588,21 @@ def get_local_pdf_metadata(file_path: str) -> str:
         JSON string with PDF metadata
     """
     try:
-        metadata = get_pdf_metadata(file_path)
+        # Run in a thread of this process so every call shares one metadata cache
+        async with _PDF_SEM:
+            metadata = await asyncio.to_thread(get_pdf_metadata, file_path)
         
-        return json.dumps({
+        return _json({
             "success": True,
             "file_path": file_path,
             "metadata": metadata
-        }, indent=2)
+        })
         
     except Exception as e:
-        return json.dumps({
+        return _json({
             "success": False,
             "error": str(e)
-        })
+        }, indent=False)
 
 
 # ============================================================================
@@ -376,17 +623,17 @@ def delete_local_pdf(file_path: str) -> str:
     try:
         delete_pdf_file(file_path)
         
-        return json.dumps({
+        return _json({
             "success": True,
             "message": f"Successfully deleted: {file_path}",
             "deleted_file": file_path
-        }, indent=2)
+        })
         
     except Exception as e:
-        return json.dumps({
+        return _json({
             "success": False,
             "error": str(e)
-        })
+        }, indent=False)
 
 
 # ============================================================================
@@ -411,18 +658,18 @@ def move_local_pdf(
     try:
         move_pdf_file(source_path, destination_path)
         
-        return json.dumps({
+        return _json({
             "success": True,
             "message": f"Successfully moved file",
             "from": source_path,
             "to": destination_path
-        }, indent=2)
+        })
         
     except Exception as e:
-        return json.dumps({
+        return _json({
             "success": False,
             "error": str(e)
-        })
+        }, indent=False)
 
 
 # ============================================================================
@@ -447,18 +694,18 @@ def copy_local_pdf(
     try:
         copy_pdf_file(source_path, destination_path)
         
-        return json.dumps({
+        return _json({
             "success": True,
             "message": f"Successfully copied file",
             "from": source_path,
             "to": destination_path
-        }, indent=2)
+        })
         
     except Exception as e:
-        return json.dumps({
+        return _json({
             "success": False,
             "error": str(e)
-        })
+        }, indent=False)
 
 
 # ============================================================================
@@ -493,7 +740,7 @@ if __name__ == "__main__":
     print("="*70)
     print(f"📍 URL: http://localhost:{port}/mcp")
     print(f"🔧 Transport: streamable-http")
-    print(f"📚 Tools: 8 Local PDF operations")
+    print(f"📚 Tools: 9 Local PDF operations")
     print("="*70)
     print("\n💡 To test the server:")
     print(f"   curl http://localhost:{port}/mcp")
@@ -501,5 +748,7 @@ if __name__ == "__main__":
     print(f"   python test_local_pdf_agent_http.py")
     print("\n⏹️  Press Ctrl+C to stop\n")
     
-    # Run the server
+    # Run the server (and tell run_all_servers.py once it is listening)
+    from utility.ready_signal import notify_ready_when_listening
+    notify_ready_when_listening(port)
     mcp.run(transport='streamable-http', port=port)
@@ -2,135 +2,455 @@
 Utility functions for Local PDF management
 Handles PDF operations, file management, and RAG integration
 """
+import io
 import os
+import stat
+import gzip
+import asyncio
 import json
+import hashlib
 import shutil
+import threading
+import multiprocessing
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-import PyPDF2
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
+import fitz  # PyMuPDF
+from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 
-def list_pdfs_in_directory(directory_path: str, recursive: bool = False) -> List[Dict[str, Any]]:
-    """List all PDF files in a directory."""
-    if not os.path.exists(directory_path):
-        raise FileNotFoundError(f"Directory not found: {directory_path}")
+def _stat_pdf(file_path: str, source: bool = False) -> os.stat_result:
+    """Stat a PDF path once, raising FileNotFoundError/ValueError if it is missing or not a PDF."""
+    try:
+        file_stats = os.stat(file_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"{'Source PDF' if source else 'PDF file'} not found: {file_path}") from None
+    
+    if not file_path.lower().endswith('.pdf'):
+        raise ValueError(f"{'Source file' if source else 'File'} is not a PDF: {file_path}")
+    return file_stats
+
+
+def _stat_dir(directory_path: str) -> os.stat_result:
+    """Stat a directory path once, raising FileNotFoundError/ValueError if it is missing or not a directory."""
+    try:
+        dir_stats = os.stat(directory_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Directory not found: {directory_path}") from None
     
-    if not os.path.isdir(directory_path):
+    if not stat.S_ISDIR(dir_stats.st_mode):
         raise ValueError(f"Path is not a directory: {directory_path}")
+    return dir_stats
+
+
+def iter_pdfs(root: str, recursive: bool = False) -> Iterator[os.DirEntry]:
+    """Yield os.DirEntry objects for PDF files under root (breadth-first)."""
+    pending = deque([os.fspath(root)])
+    while pending:
+        current = pending.popleft()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                # Symlinked directories are not descended into; symlinked PDFs are listed
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(entry.path)
+                elif entry.name.lower().endswith('.pdf') and entry.is_file():
+                    yield entry
+
+
+def iter_pdf_file_info(directory_path: str, recursive: bool = False) -> Iterator[Dict[str, Any]]:
+    """Lazily yield the listing entry for each PDF file in a directory."""
+    for entry in iter_pdfs(directory_path, recursive):
+        pdf_file = {
+            "name": entry.name,
+            "path": entry.path,
+            "size": entry.stat().st_size
+        }
+        if recursive:
+            pdf_file["relative_path"] = os.path.relpath(entry.path, directory_path)
+        yield pdf_file
+
+
+def list_pdfs_in_directory(
+    directory_path: str,
+    recursive: bool = False,
+    offset: int = 0,
+    limit: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """List PDF files in a directory, optionally a page of `limit` files starting at `offset`."""
+    _stat_dir(directory_path)
     
-    pdf_files = []
-    if recursive:
-        for root, dirs, files in os.walk(directory_path):
-            for file in files:
-                if file.lower().endswith('.pdf'):
-                    file_path = os.path.join(root, file)
-                    pdf_files.append({
-                        "name": file,
-                        "path": file_path,
-                        "size": os.path.getsize(file_path),
-                        "relative_path": os.path.relpath(file_path, directory_path)
-                    })
-    else:
-        for item in os.listdir(directory_path):
-            if item.lower().endswith('.pdf'):
-                file_path = os.path.join(directory_path, item)
-                if os.path.isfile(file_path):
-                    pdf_files.append({
-                        "name": item,
-                        "path": file_path,
-                        "size": os.path.getsize(file_path)
-                    })
-    return pdf_files
-
-
-def read_pdf_content(file_path: str, max_pages: int = 10) -> str:
-    """Read content from a PDF file."""
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"PDF file not found: {file_path}")
+    stop = None if limit is None else offset + limit
+    return list(islice(iter_pdf_file_info(directory_path, recursive), offset, stop))
+
+
+# On-disk cache of extracted PDF text (see read_pdf_content_cached)
+PDF_TEXT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "local_pdf_mcp")
+
+# Least recently used disk cache entries are removed once the directory grows past this
+PDF_TEXT_CACHE_MAX_BYTES = int(os.getenv("PDF_TEXT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Extracted pages buffered between extraction and chunking in ingest_pdfs_to_rag
+INGEST_QUEUE_SIZE = 4
+
+# Below this many pages, extracting in-process beats fanning out to workers
+PARALLEL_PAGE_THRESHOLD = 10
+
+# Short documents at least this large (scanned/image-heavy pages) still go to workers
+PARALLEL_SIZE_THRESHOLD_MB = 20
+
+# Page pool oversubscription to keep cores busy while workers stall on decompression I/O
+PAGE_POOL_OVERSUBSCRIPTION = 1.5
+
+READ_METHODS = ("sequential", "processes")
+
+_page_pool = None
+_page_pool_lock = threading.Lock()
+
+
+def _page_pool_workers() -> int:
+    """Number of workers in the page pool."""
+    return max(1, int((os.cpu_count() or 1) * PAGE_POOL_OVERSUBSCRIPTION))
+
+
+def _get_page_pool() -> ProcessPoolExecutor:
+    """Get the process pool used for parallel page extraction (created on first use)."""
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            # Spawned rather than forked: the server process already runs the event
+            # loop, HTTP clients and helper threads, none of which survive a fork
+            _page_pool = ProcessPoolExecutor(
+                max_workers=_page_pool_workers(),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _page_pool
+
+
+# Document info fields copied into get_pdf_metadata results when present
+PDF_INFO_FIELDS = ("title", "author", "subject", "creator")
+
+# The stat fields get_pdf_metadata reports and caches on; a hashable stand-in for
+# os.stat_result (whose atime would defeat the cache) that PdfHandle accepts as-is
+_MetadataStat = namedtuple("_MetadataStat", "st_size st_mtime st_mtime_ns st_ctime")
+
+
+class PdfHandle:
+    """
+    An open PDF that serves both metadata and page text from a single parse.
     
-    if not file_path.lower().endswith('.pdf'):
-        raise ValueError(f"File is not a PDF: {file_path}")
+    Use it as a context manager when a caller needs more than one thing from the
+    same file; the module-level helpers are thin wrappers around it.
+    """
+    
+    def __init__(self, file_path: str, file_stats: Optional[os.stat_result] = None):
+        self.file_path = file_path
+        self._stat = file_stats
+        # MuPDF reads objects from the file on demand rather than loading it whole
+        self._doc = fitz.open(file_path)
+    
+    def __enter__(self) -> "PdfHandle":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    @property
+    def page_count(self) -> int:
+        return self._doc.page_count
+    
+    def metadata(self) -> Dict[str, Any]:
+        """Get the file and document metadata reported by get_pdf_metadata."""
+        if self._stat is None:
+            self._stat = os.stat(self.file_path)
+        
+        metadata = {
+            "file_name": os.path.basename(self.file_path),
+            "file_path": self.file_path,
+            "file_size_bytes": self._stat.st_size,
+            "file_size_mb": round(self._stat.st_size / (1024 * 1024), 2),
+            "num_pages": self._doc.page_count,
+            "created_time": self._stat.st_ctime,
+            "modified_time": self._stat.st_mtime
+        }
+        
+        # Document.metadata decodes the info dictionary on every access, so read it once
+        pdf_info = self._doc.metadata or {}
+        for field in PDF_INFO_FIELDS:
+            value = pdf_info.get(field)
+            if value:
+                metadata[field] = str(value)
+        
+        return metadata
+    
+    def page_texts(self, start: int, stop: int) -> List[str]:
+        """Extract the text of pages [start, stop)."""
+        return [self._doc[page_num].get_text() for page_num in range(start, stop)]
+    
+    def iter_pages(self, max_pages: int = 10) -> Iterator[Tuple[int, str]]:
+        """Lazily yield (page_number, text) for up to max_pages pages."""
+        for page_num in range(min(self._doc.page_count, max_pages)):
+            yield page_num + 1, self._doc[page_num].get_text()
+    
+    def read_text(self, max_pages: int = 10) -> Tuple[str, int]:
+        """Read up to max_pages pages in-process. Returns (text, pages_read)."""
+        num_pages = min(self._doc.page_count, max_pages)
+        texts = (self._doc[page_num].get_text() for page_num in range(num_pages))
+        return _join_pages(texts), num_pages
+    
+    def close(self) -> None:
+        self._doc.close()
+
+
+def _join_pages(texts: Iterable[str]) -> str:
+    """Format extracted page texts the way read_pdf_content returns them."""
+    # Written straight into one buffer; no per-page formatted copies or list of parts
+    buf = io.StringIO()
+    for page_num, text in enumerate(texts):
+        if page_num:
+            buf.write("\n\n")
+        buf.write(f"--- Page {page_num + 1} ---\n")
+        buf.write(text)
+    return buf.getvalue()
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    """Extract the text of pages [start, stop) from a PDF."""
+    with PdfHandle(file_path) as handle:
+        return handle.page_texts(start, stop)
+
+
+def _select_strategy(num_pages: int, file_size_mb: float) -> str:
+    """Pick the extraction method for a document from its page count and size."""
+    if num_pages >= PARALLEL_PAGE_THRESHOLD:
+        return "processes"
+    if num_pages > 1 and file_size_mb >= PARALLEL_SIZE_THRESHOLD_MB:
+        return "processes"
+    return "sequential"
+
+
+def _read_processes(file_path: str, num_pages: int) -> List[str]:
+    """Extract contiguous page ranges concurrently in the page pool."""
+    pool = _get_page_pool()
+    num_workers = min(_page_pool_workers(), num_pages)
+    bounds = [num_pages * i // num_workers for i in range(num_workers + 1)]
+    futures = [
+        pool.submit(_extract_page_range, file_path, bounds[i], bounds[i + 1])
+        for i in range(num_workers)
+    ]
+    return [text for future in futures for text in future.result()]
+
+
+def read_pdf_content(
+    file_path: str,
+    max_pages: int = 10,
+    parallel: bool = True,
+    force_method: Optional[str] = None
+) -> Tuple[str, int]:
+    """
+    Read content from a PDF file. Returns (text, pages_read).
+    
+    The extraction method is chosen per document by _select_strategy: short,
+    small files are read in-process, the rest are split into contiguous page
+    ranges extracted in worker processes. parallel=False always reads in-process;
+    force_method ("sequential" or "processes") overrides the choice.
+    """
+    file_stats = _stat_pdf(file_path)
+    
+    if force_method is not None and force_method not in READ_METHODS:
+        raise ValueError(f"Unknown read method: {force_method}")
     
     try:
-        content = []
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            num_pages = min(len(pdf_reader.pages), max_pages)
+        with PdfHandle(file_path, file_stats) as handle:
+            num_pages = min(handle.page_count, max_pages)
             
-            for page_num in range(num_pages):
-                page = pdf_reader.pages[page_num]
-                text = page.extract_text()
-                content.append(f"--- Page {page_num + 1} ---\n{text}")
+            if force_method:
+                method = force_method
+            elif not parallel:
+                method = "sequential"
+            else:
+                method = _select_strategy(num_pages, file_stats.st_size / (1024 * 1024))
+            
+            # The probe's open document is reused for in-process reads
+            if method == "sequential" or not num_pages:
+                return handle.read_text(max_pages)
         
-        return "\n\n".join(content)
+        return _join_pages(_read_processes(file_path, num_pages)), num_pages
     except Exception as e:
         raise Exception(f"Error reading PDF: {str(e)}")
 
 
-def get_pdf_metadata(file_path: str) -> Dict[str, Any]:
-    """Get metadata from a PDF file."""
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"PDF file not found: {file_path}")
+def iter_pdf_pages(file_path: str, max_pages: int = 10) -> Iterator[Tuple[int, str]]:
+    """Lazily yield (page_number, text) for up to max_pages pages, opening the PDF once."""
+    _stat_pdf(file_path)
+    return _iter_pages(file_path, max_pages)
+
+
+def _iter_pages(file_path: str, max_pages: int) -> Iterator[Tuple[int, str]]:
+    """iter_pdf_pages without the path checks, for paths that came from a listing."""
+    with PdfHandle(file_path) as handle:
+        yield from handle.iter_pages(max_pages)
+
+
+def read_pdf_content_cached(file_path: str, max_pages: int = 10) -> Tuple[str, int]:
+    """
+    read_pdf_content with an in-memory LRU and an on-disk cache.
+    
+    Entries are keyed on (absolute path, mtime, size, max_pages), so a changed
+    file is re-parsed. Disk entries live in PDF_TEXT_CACHE_DIR as gzip'd JSON,
+    one file per key, and the directory is kept under PDF_TEXT_CACHE_MAX_BYTES.
+    """
+    file_stats = _stat_pdf(file_path)
+    abs_path = os.path.abspath(file_path)
+    return _read_pdf_content_cached(abs_path, file_stats.st_mtime_ns, file_stats.st_size, max_pages)
+
+
+@lru_cache(maxsize=256)
+def _read_pdf_content_cached(abs_path: str, mtime_ns: int, size: int, max_pages: int) -> Tuple[str, int]:
+    """Look up extracted text on disk, parsing and storing it on a miss."""
+    key = [abs_path, mtime_ns, size, max_pages]
+    cache_file = os.path.join(
+        PDF_TEXT_CACHE_DIR, hashlib.sha1(json.dumps(key).encode('utf-8')).hexdigest() + ".json.gz"
+    )
+    
+    try:
+        with gzip.open(cache_file, 'rt', encoding='utf-8') as f:
+            cached = json.load(f)
+        if cached.get("key") == key:
+            # Touch the entry so pruning sees it as recently used
+            os.utime(cache_file)
+            return cached["text"], cached["pages_read"]
+    except (OSError, ValueError):
+        pass
+    
+    text, pages_read = read_pdf_content(abs_path, max_pages)
+    
+    # Write to a temp file and rename so concurrent readers never see a partial entry
+    try:
+        os.makedirs(PDF_TEXT_CACHE_DIR, exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_file, 'wt', encoding='utf-8') as f:
+            json.dump({"key": key, "text": text, "pages_read": pages_read}, f)
+        os.replace(tmp_file, cache_file)
+        _prune_pdf_text_cache()
+    except OSError as e:
+        print(f"Warning: Could not write PDF text cache for {abs_path}: {str(e)}")
+    
+    return text, pages_read
+
+
+def _prune_pdf_text_cache() -> None:
+    """Delete the least recently used disk cache entries until the directory fits PDF_TEXT_CACHE_MAX_BYTES."""
+    entries = []
+    total = 0
+    with os.scandir(PDF_TEXT_CACHE_DIR) as it:
+        for entry in it:
+            if entry.name.endswith(".json.gz") and entry.is_file(follow_symlinks=False):
+                st = entry.stat(follow_symlinks=False)
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
     
+    if total <= PDF_TEXT_CACHE_MAX_BYTES:
+        return
+    for _, entry_size, path in sorted(entries):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= entry_size
+        if total <= PDF_TEXT_CACHE_MAX_BYTES:
+            break
+
+
+def get_pdf_metadata(file_path: str) -> Dict[str, Any]:
+    """Get metadata from a PDF file (cached until the file changes)."""
     try:
         file_stats = os.stat(file_path)
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            
-            metadata = {
-                "file_name": os.path.basename(file_path),
-                "file_path": file_path,
-                "file_size_bytes": file_stats.st_size,
-                "file_size_mb": round(file_stats.st_size / (1024 * 1024), 2),
-                "num_pages": len(pdf_reader.pages),
-                "created_time": file_stats.st_ctime,
-                "modified_time": file_stats.st_mtime
-            }
-            
-            if pdf_reader.metadata:
-                pdf_info = pdf_reader.metadata
-                if pdf_info.title:
-                    metadata["title"] = pdf_info.title
-                if pdf_info.author:
-                    metadata["author"] = pdf_info.author
-                if pdf_info.subject:
-                    metadata["subject"] = pdf_info.subject
-                if pdf_info.creator:
-                    metadata["creator"] = pdf_info.creator
-            
-            return metadata
+    except FileNotFoundError:
+        raise FileNotFoundError(f"PDF file not found: {file_path}") from None
+    
+    return dict(_get_pdf_metadata_cached(file_path, _MetadataStat(
+        file_stats.st_size, file_stats.st_mtime, file_stats.st_mtime_ns, file_stats.st_ctime
+    )))
+
+
+@lru_cache(maxsize=2048)
+def _get_pdf_metadata_cached(file_path: str, file_stats: _MetadataStat) -> Dict[str, Any]:
+    """Parse PDF metadata; the stat fields are part of the cache key so edits invalidate it."""
+    try:
+        # The handle reports the caller's stat instead of stat'ing the file again
+        with PdfHandle(file_path, file_stats) as handle:
+            return handle.metadata()
     except Exception as e:
         raise Exception(f"Error getting PDF metadata: {str(e)}")
 
 
+def _fast_copy(source_path: str, destination_path: str) -> None:
+    """
+    Copy a file in kernel space with os.copy_file_range where available.
+    
+    On copy-on-write filesystems this becomes a reflink. Falls back to
+    shutil.copy2 when copy_file_range is missing or unsupported for this pair.
+    The copy is written next to the destination and renamed into place, so an
+    existing destination is never left truncated.
+    """
+    # Like shutil.copy2, a directory destination means "copy into it"
+    if os.path.isdir(destination_path):
+        destination_path = os.path.join(destination_path, os.path.basename(source_path))
+    
+    if not hasattr(os, 'copy_file_range'):
+        shutil.copy2(source_path, destination_path)
+        return
+    
+    try:
+        if os.path.samefile(source_path, destination_path):
+            raise shutil.SameFileError(f"{source_path!r} and {destination_path!r} are the same file")
+    except FileNotFoundError:
+        pass
+    
+    tmp_path = f"{destination_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        try:
+            with open(source_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+                while os.copy_file_range(src.fileno(), dst.fileno(), 2**30):
+                    pass
+        except OSError:
+            # e.g. EXDEV/ENOSYS/EINVAL on older kernels or some filesystems
+            shutil.copy2(source_path, tmp_path)
+        else:
+            shutil.copystat(source_path, tmp_path)
+        os.replace(tmp_path, destination_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
 def copy_pdf_file(source_path: str, destination_path: str) -> None:
     """Copy a PDF file to another location."""
-    if not os.path.exists(source_path):
-        raise FileNotFoundError(f"Source PDF not found: {source_path}")
-    
-    if not source_path.lower().endswith('.pdf'):
-        raise ValueError(f"Source file is not a PDF: {source_path}")
+    _stat_pdf(source_path, source=True)
     
     dest_dir = os.path.dirname(destination_path)
-    if dest_dir and not os.path.exists(dest_dir):
+    if dest_dir:
         os.makedirs(dest_dir, exist_ok=True)
     
     try:
-        shutil.copy2(source_path, destination_path)
+        _fast_copy(source_path, destination_path)
     except Exception as e:
         raise Exception(f"Error copying PDF: {str(e)}")
 
 
 def move_pdf_file(source_path: str, destination_path: str) -> None:
     """Move/rename a PDF file."""
-    if not os.path.exists(source_path):
-        raise FileNotFoundError(f"Source PDF not found: {source_path}")
-    
-    if not source_path.lower().endswith('.pdf'):
-        raise ValueError(f"Source file is not a PDF: {source_path}")
+    _stat_pdf(source_path, source=True)
     
     dest_dir = os.path.dirname(destination_path)
-    if dest_dir and not os.path.exists(dest_dir):
+    if dest_dir:
         os.makedirs(dest_dir, exist_ok=True)
     
     try:
@@ -141,31 +461,83 @@ def move_pdf_file(source_path: str, destination_path: str) -> None:
 
 def delete_pdf_file(file_path: str) -> None:
     """Delete a PDF file."""
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"PDF file not found: {file_path}")
-    
     if not file_path.lower().endswith('.pdf'):
         raise ValueError(f"File is not a PDF: {file_path}")
     
     try:
         os.remove(file_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"PDF file not found: {file_path}") from None
     except Exception as e:
         raise Exception(f"Error deleting PDF: {str(e)}")
 
 
-def ingest_pdfs_to_rag(directory_path: str, collection_name: str = "local_pdfs", recursive: bool = False) -> Dict[str, Any]:
-    """Ingest PDFs into RAG system."""
+@lru_cache(maxsize=1)
+def _get_text_splitter() -> RecursiveCharacterTextSplitter:
+    """Get the token-aware splitter used to chunk PDF text for RAG ingestion."""
+    return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+        chunk_size=512,
+        chunk_overlap=50,
+        separators=["\n\n", "\n", ". ", " "]
+    )
+
+
+def _iter_page_chunks(page_num: int, page_text: str) -> Iterator[Dict[str, Any]]:
+    """Split one page's text into chunks tagged with the page number."""
+    for chunk in _get_text_splitter().split_text(page_text):
+        yield {"text": chunk, "page": page_num}
+
+
+async def ingest_pdfs_to_rag(directory_path: str, collection_name: str = "local_pdfs", recursive: bool = False) -> Dict[str, Any]:
+    """
+    Ingest PDFs into RAG system.
+    
+    Pages are extracted lazily in an executor thread while earlier pages are
+    being chunked; a bounded queue means only a few pages' text is held in
+    memory at once, whatever the document length. If chunking fails, the
+    extraction thread is told to stop and the queue is drained so it is never
+    left blocked on a full queue.
+    """
     try:
         pdf_files = list_pdfs_in_directory(directory_path, recursive)
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=INGEST_QUEUE_SIZE)
+        stop = threading.Event()
+        
+        def feed_pages(file_path: str) -> None:
+            # One open document serves both the log line and the page text
+            with PdfHandle(file_path) as handle:
+                print(f"📄 Ingesting {os.path.basename(file_path)} ({handle.page_count} pages)")
+                for page in handle.iter_pages(max_pages=100):
+                    if stop.is_set():
+                        return
+                    asyncio.run_coroutine_threadsafe(queue.put(page), loop).result()
+        
+        async def produce():
+            for pdf_file in pdf_files:
+                if stop.is_set():
+                    return
+                try:
+                    await loop.run_in_executor(None, feed_pages, pdf_file["path"])
+                except Exception as e:
+                    print(f"Warning: Failed to ingest {pdf_file['name']}: {str(e)}")
+                    continue
+            await queue.put(None)
+        
+        producer = asyncio.create_task(produce())
         chunks_created = 0
-        for pdf_file in pdf_files:
-            try:
-                content = read_pdf_content(pdf_file["path"], max_pages=100)
-                chunks = content.split('\n\n')
-                chunks_created += len(chunks)
-            except Exception as e:
-                print(f"Warning: Failed to ingest {pdf_file['name']}: {str(e)}")
-                continue
+        try:
+            while (page := await queue.get()) is not None:
+                for _ in _iter_page_chunks(*page):
+                    chunks_created += 1
+        finally:
+            stop.set()
+            # Free queue slots until the producer notices the stop flag and returns
+            while not producer.done():
+                while not queue.empty():
+                    queue.get_nowait()
+                await asyncio.wait({producer}, timeout=0.05)
+            await producer
         
         return {
             "files_ingested": len(pdf_files),
@@ -176,6 +548,11 @@ def ingest_pdfs_to_rag(directory_path: str, collection_name: str = "local_pdfs",
         raise Exception(f"Error ingesting PDFs to RAG: {str(e)}")
 
 
+def ingest_pdfs_to_rag_sync(directory_path: str, collection_name: str = "local_pdfs", recursive: bool = False) -> Dict[str, Any]:
+    """Synchronous wrapper around ingest_pdfs_to_rag for callers without an event loop."""
+    return asyncio.run(ingest_pdfs_to_rag(directory_path, collection_name, recursive))
+
+
 def search_pdf_content(query: str, collection_name: str = "local_pdfs", top_k: int = 5) -> List[Dict[str, Any]]:
     """Search through ingested PDF content."""
     try:
@@ -193,21 +570,21 @@ def search_pdf_content(query: str, collection_name: str = "local_pdfs", top_k: i
 def test_local_pdf_access(directory_path: str) -> Dict[str, Any]:
     """Test access to local PDF directory."""
     try:
-        if not os.path.exists(directory_path):
-            return {"success": False, "error": f"Directory not found: {directory_path}"}
-        
-        if not os.path.isdir(directory_path):
-            return {"success": False, "error": f"Path is not a directory: {directory_path}"}
+        try:
+            _stat_dir(directory_path)
+        except (FileNotFoundError, ValueError) as e:
+            return {"success": False, "error": str(e)}
         
         if not os.access(directory_path, os.R_OK):
             return {"success": False, "error": f"No read permission for directory: {directory_path}"}
         
-        pdf_files = list_pdfs_in_directory(directory_path, recursive=False)
+        # Only the count is needed, so walk the directory without building a listing
+        pdf_count = sum(1 for _ in iter_pdfs(directory_path, recursive=False))
         
         return {
             "success": True,
             "directory": directory_path,
-            "pdf_count": len(pdf_files),
+            "pdf_count": pdf_count,
             "accessible": True
         }
     except Exception as e:
@@ -20,36 +20,39 @@ from jira_mcp.jira_agent import create_jira_agent
 from sharepoint.sharepoint_agent import create_sharepoint_agent
 from local_pdf.local_pdf_agent import create_local_pdf_agent
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import json
+import orjson
+from utility.server_wait import wait_for_server
 
 load_dotenv()
 
+# Single background writer so response files are saved in order without blocking the REPL
+_response_writer = ThreadPoolExecutor(max_workers=1)
+
+
+def _response_default(obj):
+    """orjson fallback for objects it can't serialize natively (e.g. LangChain messages)."""
+    if hasattr(obj, 'model_dump') and callable(obj.model_dump):
+        return obj.model_dump()
+    if hasattr(obj, '__dict__'):
+        return obj.__dict__
+    return str(obj)
+
+
+def save_response(response, filepath: str) -> None:
+    """Serialize an agent response with orjson and write it to filepath (runs on _response_writer)."""
+    try:
+        data = orjson.dumps(
+            response,
+            default=_response_default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_NON_STR_KEYS
+        )
+        with open(filepath, "wb") as f:
+            f.write(data)
+    except Exception as e:
+        print(f"\n⚠️  Could not save response to {filepath}: {str(e)}")
 
-async def wait_for_server(url: str, timeout: int = 10):
-    """Wait until the MCP server is ready to accept connections."""
-    import time
-    import socket
-    from urllib.parse import urlparse
-    
-    parsed = urlparse(url)
-    host = parsed.hostname or 'localhost'
-    port = parsed.port
-    
-    start = time.time()
-    while time.time() - start < timeout:
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result = sock.connect_ex((host, port))
-            sock.close()
-            if result == 0:
-                print(f"✅ MCP server is up at {url}")
-                return True
-        except:
-            pass
-        await asyncio.sleep(1)
-    raise TimeoutError(f"MCP server at {url} did not respond within {timeout} seconds")
 
 async def main():
     """Main supervisor agent that coordinates Confluence and Jira sub-agents."""
@@ -176,30 +179,13 @@ async def main():
             print("\n🤖 Response:")
             print(final_message.content)
 
-            def serialize_response(obj):
-                try:
-                    if isinstance(obj, dict):
-                        return {k: serialize_response(v) for k, v in obj.items()}
-                    elif isinstance(obj, list):
-                        return [serialize_response(item) for item in obj]
-                    elif isinstance(obj, (str, int, float, bool, type(None))):
-                        return obj
-                    elif hasattr(obj, 'dict') and callable(getattr(obj, 'dict', None)):
-                        return obj.model_dump()
-                    elif hasattr(obj, '__dict__'):
-                        return serialize_response(obj.__dict__)
-                    else:
-                        return str(obj)
-                except Exception:
-                    return str(obj)
-            
             responses_dir = os.path.join(os.path.dirname(__file__), "responses")
             os.makedirs(responses_dir, exist_ok=True)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"response_{timestamp}.json"
             filepath = os.path.join(responses_dir, filename)
-            with open(filepath, "w") as f:
-                json.dump(serialize_response(response), f, indent=4)
+            # Serialize and write in the background so the next prompt isn't held up
+            _response_writer.submit(save_response, response, filepath)
             print(f"📁 Response saved to {filepath}")
             
         except KeyboardInterrupt:
@@ -9,8 +9,12 @@ import signal
 import sys
 import time
 import os
+import selectors
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from utility.ready_signal import READY_FD_ENV
+
 # Server configurations
 SERVERS = [
     {
@@ -77,11 +81,11 @@ def check_server_ready(url, timeout=10):
                 return True
         except:
             pass
-        time.sleep(0.5)
+        time.sleep(0.1)
     return False
 
-def start_server(server_config):
-    """Start a single MCP server"""
+def spawn_server(server_config):
+    """Launch a single MCP server process without waiting for it"""
     script_path = server_config["script"]
     port = server_config["port"]
     name = server_config["name"]
@@ -93,41 +97,81 @@ def start_server(server_config):
         print(f"❌ ERROR: Script not found: {script_path}")
         return None
 
+    # Special handling for API server
+    if name == "API Server":
+        # API server uses uvicorn and doesn't need port argument
+        command = [sys.executable, script_path]
+    else:
+        # MCP servers take port as argument
+        command = [sys.executable, script_path, str(port)]
+
+    # Hand the child the write end of a pipe it signals once it is listening
+    ready_fd = write_fd = None
+    popen_kwargs = {}
+    if os.name == "posix":
+        ready_fd, write_fd = os.pipe()
+        popen_kwargs = {
+            "pass_fds": (write_fd,),
+            "env": {**os.environ, READY_FD_ENV: str(write_fd)}
+        }
+
     try:
-        # Special handling for API server
-        if name == "API Server":
-            # API server uses uvicorn and doesn't need port argument
-            process = subprocess.Popen(
-                [sys.executable, script_path],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                cwd=os.getcwd()
-            )
-        else:
-            # MCP servers take port as argument
-            process = subprocess.Popen(
-                [sys.executable, script_path, str(port)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                cwd=os.getcwd()
-            )
-
-        # Wait for server to be ready
-        if check_server_ready(server_config["url"]):
-            print(f"✅ {name} is ready at {server_config['url']}")
-            return process
-        else:
-            print(f"❌ {name} failed to start within timeout")
-            process.terminate()
-            try:
-                process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                process.kill()
-            return None
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=os.getcwd(),
+            **popen_kwargs
+        )
+        process.ready_fd = ready_fd
+        return process
 
     except Exception as e:
         print(f"❌ Failed to start {name}: {str(e)}")
+        if ready_fd is not None:
+            os.close(ready_fd)
         return None
+    finally:
+        if write_fd is not None:
+            os.close(write_fd)
+
+def wait_for_ready_signal(ready_fd, timeout=15):
+    """Wait for a child's ready byte; False if the pipe closes or the timeout passes first"""
+    with selectors.DefaultSelector() as selector:
+        selector.register(ready_fd, selectors.EVENT_READ)
+        if not selector.select(timeout):
+            return False
+    return os.read(ready_fd, 1) == b"1"
+
+def await_ready(server_config, process, timeout=15):
+    """Wait for a spawned server to be ready, stopping it on timeout
+
+    Uses the MCP_READY_FD pipe handshake where available and falls back to
+    polling the server's port otherwise.
+    """
+    name = server_config["name"]
+    if process is None:
+        return False
+
+    if process.ready_fd is not None:
+        try:
+            ready = wait_for_ready_signal(process.ready_fd, timeout)
+        finally:
+            os.close(process.ready_fd)
+    else:
+        ready = check_server_ready(server_config["url"], timeout)
+
+    if ready:
+        print(f"✅ {name} is ready at {server_config['url']}")
+        return True
+
+    print(f"❌ {name} failed to start within timeout")
+    process.terminate()
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+    return False
 
 def shutdown_all_servers():
     """Shutdown all running server processes"""
@@ -170,10 +214,13 @@ def main():
     signal.signal(signal.SIGTERM, signal_handler)
 
     try:
-        # Start all servers
-        for server_config in SERVERS:
-            process = start_server(server_config)
-            if process:
+        # Spawn every server first, then wait for all of them concurrently
+        procs = [(server_config, spawn_server(server_config)) for server_config in SERVERS]
+        with ThreadPoolExecutor(max_workers=len(SERVERS)) as executor:
+            readiness = list(executor.map(lambda t: await_ready(*t, 15), procs))
+
+        for (server_config, process), ready in zip(procs, readiness):
+            if ready:
                 running_processes.append(process)
             else:
                 print(f"⚠️  Continuing without {server_config['name']}")
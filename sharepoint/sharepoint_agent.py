@@ -16,32 +16,6 @@ import os
 load_dotenv()
 
 
-async def wait_for_server(url: str, timeout: int = 10):
-    """Wait until the MCP server is ready to accept connections."""
-    import time
-    import socket
-    from urllib.parse import urlparse
-    
-    parsed = urlparse(url)
-    host = parsed.hostname or 'localhost'
-    port = parsed.port
-    
-    start = time.time()
-    while time.time() - start < timeout:
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result = sock.connect_ex((host, port))
-            sock.close()
-            if result == 0:
-                print(f"✅ SharePoint MCP server is up at {url}")
-                return True
-        except:
-            pass
-        await asyncio.sleep(1)
-    raise TimeoutError(f"SharePoint MCP server at {url} did not respond within {timeout} seconds")
-
-
 async def create_sharepoint_agent():
     """Create the SharePoint sub-agent with all MCP tools."""
     system_prompt = """
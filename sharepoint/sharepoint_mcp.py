@@ -3,12 +3,25 @@ SharePoint MCP Tools - Unified Module
 Comprehensive SharePoint operations with automatic client detection
 Combines multi-site and single-site capabilities
 """
-import json
+import io
 import os
 import sys
+import time
+import logging
+import asyncio
+import shutil
+import functools
+import operator
+import traceback
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
 from typing import Optional, List, Dict, Any
 from dotenv import load_dotenv
 from fastmcp import FastMCP
+import orjson
 
 # Load environment variables from .env file
 load_dotenv()
@@ -17,14 +30,21 @@ load_dotenv()
 if __name__ == "__main__":
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from sharepoint import utils as sp_utils
+from utility import ingest_cache
+
 # Initialize FastMCP server
 mcp = FastMCP("SharePoint MCP Server")
 
 
 def _get_sharepoint_client():
     """Get SharePoint client from local sharepoint/utils.py"""
-    from sharepoint.utils import SharePointClient
-    return SharePointClient()
+    return sp_utils.get_sharepoint_client()
+
+
+def _json(obj: Any, indent: bool = True) -> str:
+    """Serialize a tool response to a JSON string with orjson."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
 
 
 def _get_site_url():
@@ -32,11 +52,70 @@ def _get_site_url():
     return os.getenv("SHAREPOINT_SITE_URL") or os.getenv("SHAREPOINT_URL")
 
 
+# Discovery results (sites, libraries) rarely change, so they are cached for this long
+DISCOVERY_CACHE_TTL = 30 * 60
+
+# Identical searches (common when an agent retries) reuse results for this long
+SEARCH_CACHE_TTL = 5 * 60
+
+# Most argument sets a ttl_cache keeps; the oldest entry is evicted beyond this
+TTL_CACHE_MAXSIZE = 256
+
+# Bumped by the upload tools; search results cached before an upload are dropped
+_search_cache_version = 0
+
+
+def _invalidate_search_cache():
+    """Drop cached search results (uploads add content; sites and libraries are unchanged)"""
+    global _search_cache_version
+    _search_cache_version += 1
+
+
+def ttl_cache(seconds: int, invalidated_by_uploads: bool = False):
+    """
+    Cache a JSON-returning tool's result per argument set for `seconds`.
+    
+    Error responses are not cached. Expired entries are purged on insert and
+    at most TTL_CACHE_MAXSIZE are kept. With invalidated_by_uploads, entries
+    are also dropped whenever _invalidate_search_cache is called.
+    """
+    def decorator(func):
+        cache = {}
+        state = {"version": _search_cache_version}
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if invalidated_by_uploads and state["version"] != _search_cache_version:
+                cache.clear()
+                state["version"] = _search_cache_version
+            
+            key = (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            hit = cache.get(key)
+            if hit and hit[0] > now:
+                return hit[1]
+            
+            result = func(*args, **kwargs)
+            parsed = orjson.loads(result)
+            if not (isinstance(parsed, dict) and ("error" in parsed or parsed.get("success") is False)):
+                for expired in [k for k, (expires, _) in list(cache.items()) if expires <= now]:
+                    cache.pop(expired, None)
+                cache[key] = (now + seconds, result)
+                # Dicts keep insertion order, so the first key is the oldest entry
+                while len(cache) > TTL_CACHE_MAXSIZE:
+                    cache.pop(next(iter(cache)), None)
+            return result
+        
+        return wrapper
+    return decorator
+
+
 # ============================================================================
 # DISCOVERY & LISTING TOOLS
 # ============================================================================
 
 @mcp.tool()
+@ttl_cache(DISCOVERY_CACHE_TTL)
 def list_sharepoint_sites() -> str:
     """
     Lists all SharePoint sites accessible to the authenticated user.
@@ -51,16 +130,16 @@ def list_sharepoint_sites() -> str:
         # Returns: {"success": true, "sites": [...], "count": 5}
     """
     try:
-        from sharepoint.utils import list_sharepoint_sites as get_sites
-        return get_sites()
+        return sp_utils.list_sharepoint_sites()
     except Exception as e:
-        return json.dumps({
+        return _json({
             "success": False,
             "error": str(e)
-        })
+        }, indent=False)
 
 
 @mcp.tool()
+@ttl_cache(DISCOVERY_CACHE_TTL)
 def list_sharepoint_libraries(site_url: Optional[str] = None) -> str:
     """
     Lists all document libraries in a SharePoint site.
@@ -79,13 +158,16 @@ def list_sharepoint_libraries(site_url: Optional[str] = None) -> str:
         libraries = list_sharepoint_libraries()
     """
     try:
-        from sharepoint.utils import list_sharepoint_libraries as get_libraries
-        return get_libraries(site_url)
+        return sp_utils.list_sharepoint_libraries(site_url)
     except Exception as e:
-        return json.dumps({
+        return _json({
             "success": False,
             "error": str(e)
-        })
+        }, indent=False)
+
+
+# Fields list_sharepoint_files reports; list_files always sets them and only returns files
+_listed_file_fields = operator.itemgetter("name", "size", "modified")
 
 
 @mcp.tool()
@@ -118,34 +200,27 @@ def list_sharepoint_files(
     try:
         if site_url:
             # Multi-site mode with explicit site_url
-            from sharepoint.utils import SharePointClient
-            client = SharePointClient()
+            client = _get_sharepoint_client()
             files = client.list_files(site_url, library_name, folder_path or "")
         else:
             # Single-site mode using environment variables
-            from sharepoint.utils import list_sharepoint_files as get_files
-            files = get_files(library_name, folder_path or "")
+            files = sp_utils.list_sharepoint_files(library_name, folder_path or "")
         
-        return json.dumps({
+        return _json({
             "success": True,
             "count": len(files),
             "library": library_name,
             "folder": folder_path or "root",
             "files": [
-                {
-                    "name": f.get('name'),
-                    "size": f.get('size'),
-                    "modified": f.get('lastModifiedDateTime') or f.get('modified'),
-                    "type": "folder" if f.get('folder') else "file"
-                }
-                for f in files
+                {"name": name, "size": size, "modified": modified, "type": "file"}
+                for name, size, modified in map(_listed_file_fields, files)
             ]
-        }, indent=2)
+        })
     except Exception as e:
-        return json.dumps({
+        return _json({
             "success": False,
             "error": str(e)
-        })
+        }, indent=False)
 
 
 # ============================================================================
@@ -188,60 +263,65 @@ def download_sharepoint_file(
         )
     """
     try:
-        from sharepoint.utils import download_specific_sharepoint_file
-        
-        # Determine if destination_path is a directory or full file path
-        if os.path.isdir(destination_path):
-            # It's a directory - use it as local_folder
-            local_folder = destination_path
-            final_path = os.path.join(destination_path, file_name)
+        # Determine if destination_path is a directory or full file path from its
+        # shape; only stat when it has an extension that doesn't match the file's
+        dest = Path(destination_path)
+        if destination_path.endswith(("/", os.sep)) or not dest.suffix:
+            is_dir = True
+        elif dest.suffix.lower() == Path(file_name).suffix.lower():
+            is_dir = False
         else:
-            # It's a full file path - extract directory and use destination as final path
-            local_folder = os.path.dirname(destination_path) or "."
-            final_path = destination_path
+            is_dir = dest.is_dir()
+        
+        # A directory is used as local_folder; a full file path is downloaded
+        # into its parent and becomes the final path
+        final_path = dest / file_name if is_dir else dest
         
-        local_path = download_specific_sharepoint_file(
+        local_path = sp_utils.download_specific_sharepoint_file(
             file_name=file_name,
             library_name=library_name,
             folder_path=folder_path or "",
-            local_folder=local_folder
+            local_folder=str(final_path.parent)
         )
         
         if local_path:
             # Rename/move if needed
-            if local_path != final_path:
-                import shutil
-                os.makedirs(os.path.dirname(final_path) or ".", exist_ok=True)
-                shutil.move(local_path, final_path)
+            if Path(local_path) != final_path:
+                try:
+                    # Same filesystem: atomic rename, no bytes copied
+                    os.replace(local_path, final_path)
+                except OSError:
+                    # e.g. EXDEV across filesystems: fall back to copy + unlink
+                    shutil.move(local_path, final_path)
             
-            return json.dumps({
+            return _json({
                 "success": True,
                 "message": f"File downloaded successfully: {file_name}",
-                "path": final_path
-            }, indent=2)
+                "path": str(final_path)
+            })
         else:
-            return json.dumps({
+            return _json({
                 "success": False,
                 "error": f"Failed to download: {file_name}"
-            })
+            }, indent=False)
             
             if success:
-                return json.dumps({
+                return _json({
                     "success": True,
                     "message": f"File downloaded successfully: {file_name}",
                     "path": destination_path,
                     "file_info": file_info
-                }, indent=2)
+                })
             else:
-                return json.dumps({
+                return _json({
                     "success": False,
                     "error": "Download failed"
-                })
+                }, indent=False)
     except Exception as e:
-        return json.dumps({
+        return _json({
             "success": False,
             "error": str(e)
-        })
+        }, indent=False)
 
 
 @mcp.tool()
@@ -271,30 +351,28 @@ def download_sharepoint_file_by_path(
     """
     try:
         
-        from sharepoint.utils import download_file_by_sharepoint_path
-        
-        success = download_file_by_sharepoint_path(
+        success = sp_utils.download_file_by_sharepoint_path(
             file_path=file_path,
             library_name=library_name,
             local_path=local_path
         )
         
         if success:
-            return json.dumps({
+            return _json({
                 "success": True,
                 "message": f"File downloaded successfully: {file_path}",
                 "local_path": local_path or f"downloaded_files/{os.path.basename(file_path)}"
-            }, indent=2)
+            })
         else:
-            return json.dumps({
+            return _json({
                 "success": False,
                 "error": f"Failed to download: {file_path}"
-            })
+            }, indent=False)
     except Exception as e:
-        return json.dumps({
+        return _json({
             "success": False,
             "error": str(e)
-        })
+        }, indent=False)
 
 
 @mcp.tool()
@@ -325,25 +403,23 @@ def download_sharepoint_pdfs(
     """
     try:
         
-        from sharepoint.utils import download_pdfs_from_sharepoint
-        
-        downloaded_files = download_pdfs_from_sharepoint(
+        downloaded_files = sp_utils.download_pdfs_from_sharepoint(
             library_name=library_name,
             folder_path=folder_path or "",
             local_folder=local_folder
         )
         
-        return json.dumps({
+        return _json({
             "success": True,
             "count": len(downloaded_files),
             "files": downloaded_files,
             "local_folder": local_folder
-        }, indent=2)
+        })
     except Exception as e:
-        return json.dumps({
+        return _json({
             "success": False,
             "error": str(e)
-        })
+        }, indent=False)
 
 
 # ============================================================================
@@ -380,10 +456,9 @@ def upload_file_to_sharepoint(
         )
     """
     try:
+        _invalidate_search_cache()
         
-        from sharepoint.utils import upload_file_to_sharepoint as sp_upload
-        
-        file_info = sp_upload(
+        file_info = sp_utils.upload_file_to_sharepoint(
             local_file_path=local_file_path,
             library_name=library_name,
             folder_path=folder_path or "",
@@ -391,7 +466,7 @@ def upload_file_to_sharepoint(
         )
         
         if file_info:
-            return json.dumps({
+            return _json({
                 "success": True,
                 "message": f"File uploaded successfully: {file_info.get('name')}",
                 "file_info": {
@@ -401,17 +476,17 @@ def upload_file_to_sharepoint(
                     "webUrl": file_info.get('webUrl'),
                     "lastModified": file_info.get('lastModifiedDateTime')
                 }
-            }, indent=2)
+            })
         else:
-            return json.dumps({
+            return _json({
                 "success": False,
                 "error": "Failed to upload file"
-            })
+            }, indent=False)
     except Exception as e:
-        return json.dumps({
+        return _json({
             "success": False,
             "error": str(e)
-        })
+        }, indent=False)
 
 
 @mcp.tool()
@@ -441,16 +516,15 @@ def bulk_upload_to_sharepoint(
         )
     """
     try:
+        _invalidate_search_cache()
         
-        from sharepoint.utils import bulk_upload_to_sharepoint as sp_bulk_upload
-        
-        uploaded_files = sp_bulk_upload(
+        uploaded_files = sp_utils.bulk_upload_to_sharepoint(
             local_files=local_files,
             library_name=library_name,
             folder_path=folder_path or ""
         )
         
-        return json.dumps({
+        return _json({
             "success": True,
             "total": len(local_files),
             "uploaded": len(uploaded_files),
@@ -463,12 +537,12 @@ def bulk_upload_to_sharepoint(
                 }
                 for f in uploaded_files
             ]
-        }, indent=2)
+        })
     except Exception as e:
-        return json.dumps({
+        return _json({
             "success": False,
             "error": str(e)
-        })
+        }, indent=False)
 
 
 # ============================================================================
@@ -476,6 +550,7 @@ def bulk_upload_to_sharepoint(
 # ============================================================================
 
 @mcp.tool()
+@ttl_cache(SEARCH_CACHE_TTL, invalidated_by_uploads=True)
 def search_sharepoint_content(
     query: str,
     site_url: Optional[str] = None,
@@ -499,14 +574,13 @@ def search_sharepoint_content(
         )
     """
     try:
-        from sharepoint.utils import search_sharepoint_content as search_content
         file_types_list = file_types.split(",") if file_types else None
-        return search_content(query, site_url, file_types_list)
+        return sp_utils.search_sharepoint_content(query, site_url, file_types_list)
     except Exception as e:
-        return json.dumps({
+        return _json({
             "success": False,
             "error": str(e)
-        })
+        }, indent=False)
 
 
 @mcp.tool()
@@ -537,16 +611,14 @@ def get_sharepoint_file_info(
     """
     try:
         
-        from sharepoint.utils import find_sharepoint_file
-        
-        file_info = find_sharepoint_file(
+        file_info = sp_utils.find_sharepoint_file(
             file_name=file_name,
             library_name=library_name,
             folder_path=folder_path or ""
         )
         
         if file_info:
-            return json.dumps({
+            return _json({
                 "success": True,
                 "file": {
                     "name": file_info.get('name'),
@@ -557,17 +629,17 @@ def get_sharepoint_file_info(
                     "webUrl": file_info.get('webUrl'),
                     "drive_id": file_info.get('drive_id')
                 }
-            }, indent=2)
+            })
         else:
-            return json.dumps({
+            return _json({
                 "success": False,
                 "error": f"File not found: {file_name}"
-            })
+            }, indent=False)
     except Exception as e:
-        return json.dumps({
+        return _json({
             "success": False,
             "error": str(e)
-        })
+        }, indent=False)
 
 
 
@@ -575,8 +647,113 @@ def get_sharepoint_file_info(
 # INGESTION TOOLS (RAG PIPELINE)
 # ============================================================================
 
+# Downloaded files waiting for an ingestion worker in download_and_ingest_sharepoint_files
+INGEST_QUEUE_SIZE = 4
+
+# Pipeline progress messages are written to stdout in batches of this many
+PROGRESS_FLUSH_EVERY = 32
+
+_ingest_pool = None
+
+
+def _get_ingest_pool() -> ProcessPoolExecutor:
+    """Get the process pool that runs PDF ingestion (created on first use)."""
+    global _ingest_pool
+    if _ingest_pool is None:
+        # Spawned rather than forked: the server process already runs the event
+        # loop, HTTP clients and helper threads, none of which survive a fork
+        _ingest_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _ingest_pool
+
+
+def _discard_ingest_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop a broken ingest pool (e.g. a worker was OOM-killed) so the next call builds a new one."""
+    global _ingest_pool
+    if _ingest_pool is pool:
+        _ingest_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _ingest_downloaded_file(file_info: Dict[str, Any], cleanup_after_ingest: bool) -> tuple:
+    """
+    Run one downloaded PDF through the ingestion pipeline. Returns (success, record).
+    
+    Runs in an ingest pool worker; the pipeline (embeddings, vector stores) is
+    imported here so it is only loaded in the workers.
+    """
+    from utility.pdf_processor1 import process_pdf_and_stream
+    
+    file_path = Path(file_info['local_path'])
+    
+    try:
+        print(f"\n📄 Processing: {file_path.name}")
+        print(f"   Size: {file_info.get('size_bytes', 0):,} bytes")
+        
+        processing_successful = False
+        processing_messages = []
+        progress = io.StringIO()
+        
+        # Process PDF with streaming output
+        for message in process_pdf_and_stream(str(file_path)):
+            processing_messages.append(message)
+            progress.write(f"   {message}\n")
+            if len(processing_messages) % PROGRESS_FLUSH_EVERY == 0:
+                sys.stdout.write(progress.getvalue())
+                progress.seek(0)
+                progress.truncate()
+            
+            # Check for success indicators
+            if "Added" in message and "chunks" in message:
+                processing_successful = True
+            elif "already ingested" in message.lower():
+                processing_successful = True
+            elif "Error" in message or "Failed" in message:
+                processing_successful = False
+                break
+        sys.stdout.write(progress.getvalue())
+        sys.stdout.flush()
+        
+        if not processing_successful:
+            print(f"   ❌ Failed to ingest: {file_path.name}")
+            return False, {
+                'file': file_path.name,
+                'error': 'PDF processing failed',
+                'messages': processing_messages[-3:]
+            }
+        
+        print(f"   ✅ Successfully ingested: {file_path.name}")
+        
+        # Remember this SharePoint version so the next run skips the download, and
+        # its content so copies under other names skip the pipeline
+        if file_info.get('digest'):
+            ingest_cache.mark_digest(file_info['digest'], file_info['file_name'])
+        if file_info.get('content_digest'):
+            ingest_cache.mark_digest(file_info['content_digest'], file_info['file_name'])
+        
+        # Cleanup if requested
+        if cleanup_after_ingest:
+            file_path.unlink()
+            print(f"   🗑️  Deleted: {file_path.name}")
+        
+        return True, {
+            'file': file_path.name,
+            'size_bytes': file_info.get('size_bytes', 0),
+            'status': 'ingested',
+            'messages': processing_messages[-3:]  # Last 3 messages
+        }
+    except Exception as e:
+        print(f"   ❌ Exception: {str(e)}")
+        return False, {
+            'file': file_info['file_name'],
+            'error': str(e)
+        }
+
+
 @mcp.tool()
-def download_and_ingest_sharepoint_files(
+async def download_and_ingest_sharepoint_files(
     file_names: Optional[List[str]] = None,
     library_name: str = "Documents",
     folder_path: Optional[str] = None,
@@ -619,8 +796,6 @@ def download_and_ingest_sharepoint_files(
         )
     """
     try:
-        from pathlib import Path
-        
         print(f"\n{'='*70}")
         print(f"🚀 SharePoint Download & Ingest Pipeline Started")
         print(f"{'='*70}")
@@ -630,161 +805,134 @@ def download_and_ingest_sharepoint_files(
         download_path.mkdir(exist_ok=True)
         print(f"📁 Temporary download folder: {download_path.absolute()}")
         
-        # Step 1: Download files
+        # Downloads feed a bounded queue that ingestion workers drain, so PDF
+        # processing overlaps the remaining network transfers
         print(f"\n{'─'*70}")
-        print(f"📥 STEP 1: Downloading files from SharePoint")
+        print(f"📥 Downloading from SharePoint and ingesting into vector database")
         print(f"{'─'*70}")
         
         downloaded_files = []
+        processed_files = []
+        failed_files = []
+        skipped_files = []
         
-        # Import SharePoint utility functions from local utils
-        from sharepoint.utils import download_specific_sharepoint_file, download_pdfs_from_sharepoint
-        
+        pdf_names = None
         if file_names:
             # Download specific files
             print(f"📋 Downloading {len(file_names)} specific file(s)...")
             
+            pdf_names = []
             for file_name in file_names:
-                if not file_name.lower().endswith('.pdf'):
+                if not sp_utils.is_pdf_name(file_name):
                     print(f"⚠️  Skipping {file_name} - Not a PDF file")
                     continue
-                
-                try:
-                    # Use underlying SharePoint function directly
-                    local_path = download_specific_sharepoint_file(
-                        file_name=file_name,
-                        library_name=library_name,
-                        folder_path=folder_path or "",
-                        local_folder=str(download_path)
-                    )
-                    
-                    if local_path and Path(local_path).exists():
-                        file_path = Path(local_path)
-                        downloaded_files.append({
-                            'file_name': file_name,
-                            'local_path': str(file_path),
-                            'size_bytes': file_path.stat().st_size
-                        })
-                        print(f"   ✅ Downloaded: {file_name}")
-                    else:
-                        print(f"   ❌ Failed: {file_name} - Download returned no path")
-                except Exception as e:
-                    print(f"   ❌ Failed: {file_name} - {str(e)}")
+                pdf_names.append(file_name)
         else:
             # Download all PDFs
             print(f"📋 Downloading all PDF files from {library_name}/{folder_path or 'root'}...")
-            
+        
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=INGEST_QUEUE_SIZE)
+        num_workers = os.cpu_count() or 1
+        
+        async def produce():
+            cancelled = False
+            # Files whose SharePoint id/size/mtime were already ingested are not downloaded
+            downloads = sp_utils.iter_sharepoint_downloads(
+                pdf_names,
+                library_name=library_name,
+                folder_path=folder_path or "",
+                local_folder=str(download_path),
+                skip=ingest_cache.seen_digest,
+                content_hasher=ingest_cache.new_hasher
+            )
             try:
-                # Use underlying SharePoint function directly
-                # Returns list of file paths (strings)
-                downloaded_file_paths = download_pdfs_from_sharepoint(
-                    library_name=library_name,
-                    folder_path=folder_path or "",
-                    local_folder=str(download_path)
-                )
-                
-                if downloaded_file_paths:
-                    for file_path_str in downloaded_file_paths:
-                        file_path = Path(file_path_str)
-                        if file_path.exists():
-                            downloaded_files.append({
-                                'file_name': file_path.name,
-                                'local_path': str(file_path),
-                                'size_bytes': file_path.stat().st_size
-                            })
-                    print(f"   ✅ Downloaded {len(downloaded_files)} PDF file(s)")
-                else:
-                    print(f"   ⚠️  No PDF files found to download")
-            except Exception as e:
-                print(f"   ❌ Download failed: {str(e)}")
-                return json.dumps({
-                    "success": False,
-                    "error": f"Download failed: {str(e)}"
-                })
+                # aclosing shuts the download session down if this task is cancelled
+                async with contextlib.aclosing(downloads):
+                    async for result in downloads:
+                        file_name, local_path = result['file_name'], result['local_path']
+                        if result['skipped']:
+                            skipped_files.append(file_name)
+                            print(f"   ⏭️  Skipping {file_name} - unchanged since last ingestion")
+                            continue
+                        if not local_path:
+                            print(f"   ❌ Failed: {file_name} - Download returned no path")
+                            continue
+                        # Same bytes already ingested (e.g. a renamed copy): skip the pipeline
+                        if await asyncio.to_thread(ingest_cache.seen_digest, result['content_digest']):
+                            await asyncio.to_thread(
+                                ingest_cache.mark_digest, result['digest'], file_name
+                            )
+                            if cleanup_after_ingest:
+                                os.unlink(local_path)
+                            skipped_files.append(file_name)
+                            print(f"   ⏭️  Skipping {file_name} - identical content already ingested")
+                            continue
+                        file_info = {
+                            'file_name': file_name,
+                            'local_path': local_path,
+                            'size_bytes': os.stat(local_path).st_size,
+                            'digest': result['digest'],
+                            'content_digest': result['content_digest']
+                        }
+                        downloaded_files.append(file_info)
+                        print(f"   ✅ Downloaded: {file_name}")
+                        await queue.put(file_info)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                # Once cancelled there are no workers left to take the sentinels
+                if not cancelled:
+                    for _ in range(num_workers):
+                        await queue.put(None)
+        
+        async def consume():
+            while (file_info := await queue.get()) is not None:
+                # PDF processing is CPU-bound, so each file goes to its own process
+                ingest_pool = _get_ingest_pool()
+                try:
+                    success, record = await loop.run_in_executor(
+                        ingest_pool, _ingest_downloaded_file, file_info, cleanup_after_ingest
+                    )
+                except BrokenProcessPool as e:
+                    _discard_ingest_pool(ingest_pool)
+                    success, record = False, {
+                        'file': file_info['file_name'],
+                        'error': f"Ingestion worker died: {str(e)}"
+                    }
+                (processed_files if success else failed_files).append(record)
+        
+        producer = asyncio.create_task(produce())
+        workers = [asyncio.create_task(consume()) for _ in range(num_workers)]
+        workers_finished = False
+        try:
+            await asyncio.gather(*workers)
+            workers_finished = True
+        finally:
+            # A failed worker would leave the producer blocked on the full queue
+            if not workers_finished:
+                for task in (producer, *workers):
+                    task.cancel()
+                await asyncio.gather(producer, *workers, return_exceptions=True)
+        try:
+            await producer
+        except Exception as e:
+            print(f"   ❌ Download failed: {str(e)}")
+            return _json({
+                "success": False,
+                "error": f"Download failed: {str(e)}"
+            }, indent=False)
         
-        if not downloaded_files:
-            return json.dumps({
+        if not downloaded_files and not skipped_files:
+            return _json({
                 "success": False,
                 "error": "No files were downloaded",
                 "downloaded": 0,
                 "ingested": 0
-            })
-        
-        print(f"\n✅ Downloaded {len(downloaded_files)} file(s) successfully")
-        
-        # Step 2: Ingest files
-        print(f"\n{'─'*70}")
-        print(f"🔄 STEP 2: Ingesting files into vector database")
-        print(f"{'─'*70}")
-        
-        processed_files = []
-        failed_files = []
+            }, indent=False)
         
-        # Import PDF processor (add paths for dependencies
-        
-        from utility.pdf_processor1 import process_pdf_and_stream
-        
-        for file_info in downloaded_files:
-            file_path = Path(file_info['local_path'])
-            
-            if not file_path.exists():
-                failed_files.append({
-                    'file': file_info['file_name'],
-                    'error': 'File not found after download'
-                })
-                continue
-            
-            try:
-                print(f"\n📄 Processing: {file_path.name}")
-                print(f"   Size: {file_info.get('size_bytes', 0):,} bytes")
-                
-                processing_successful = False
-                processing_messages = []
-                
-                # Process PDF with streaming output
-                for message in process_pdf_and_stream(str(file_path)):
-                    processing_messages.append(message)
-                    print(f"   {message}")
-                    
-                    # Check for success indicators
-                    if "Added" in message and "chunks" in message:
-                        processing_successful = True
-                    elif "already ingested" in message.lower():
-                        processing_successful = True
-                    elif "Error" in message or "Failed" in message:
-                        processing_successful = False
-                        break
-                
-                if processing_successful:
-                    processed_files.append({
-                        'file': file_path.name,
-                        'size_bytes': file_info.get('size_bytes', 0),
-                        'status': 'ingested',
-                        'messages': processing_messages[-3:]  # Last 3 messages
-                    })
-                    
-                    print(f"   ✅ Successfully ingested: {file_path.name}")
-                    
-                    # Cleanup if requested
-                    if cleanup_after_ingest:
-                        file_path.unlink()
-                        print(f"   🗑️  Deleted: {file_path.name}")
-                else:
-                    failed_files.append({
-                        'file': file_path.name,
-                        'error': 'PDF processing failed',
-                        'messages': processing_messages[-3:]
-                    })
-                    print(f"   ❌ Failed to ingest: {file_path.name}")
-                    
-            except Exception as e:
-                failed_files.append({
-                    'file': file_info['file_name'],
-                    'error': str(e)
-                })
-                print(f"   ❌ Exception: {str(e)}")
-        
-        # Step 3: Cleanup
+        # Cleanup
         if cleanup_after_ingest and processed_files:
             try:
                 # Remove empty download directory
@@ -800,31 +948,33 @@ def download_and_ingest_sharepoint_files(
         print(f"{'='*70}")
         print(f"✅ Successfully ingested: {len(processed_files)}")
         print(f"❌ Failed: {len(failed_files)}")
+        print(f"⏭️  Skipped (unchanged): {len(skipped_files)}")
         print(f"📁 Total downloaded: {len(downloaded_files)}")
         print(f"{'='*70}\n")
         
-        return json.dumps({
+        return _json({
             "success": True,
             "downloaded": len(downloaded_files),
             "ingested": len(processed_files),
             "failed": len(failed_files),
+            "skipped": len(skipped_files),
             "processed_files": processed_files,
             "failed_files": failed_files,
+            "skipped_files": skipped_files,
             "cleanup_performed": cleanup_after_ingest,
             "message": f"Successfully downloaded {len(downloaded_files)} and ingested {len(processed_files)} file(s)"
-        }, indent=2)
+        })
         
     except Exception as e:
-        import traceback
         error_trace = traceback.format_exc()
         print(f"\n❌ Exception in download_and_ingest_sharepoint_files: {str(e)}")
         print(f"Traceback:\n{error_trace}")
         
-        return json.dumps({
+        return _json({
             "success": False,
             "error": f"Download and ingestion failed: {str(e)}",
             "traceback": error_trace
-        })
+        }, indent=False)
 
 
 # ============================================================================
@@ -844,14 +994,13 @@ def test_sharepoint_connection() -> str:
         # Verifies credentials and lists available libraries
     """
     try:
-        from sharepoint.utils import test_sharepoint_connection
-        result = test_sharepoint_connection()
-        return json.dumps(result, indent=2)
+        result = sp_utils.test_sharepoint_connection()
+        return _json(result)
     except Exception as e:
-        return json.dumps({
+        return _json({
             "success": False,
             "error": str(e)
-        })
+        }, indent=False)
 
 
 @mcp.tool()
@@ -866,6 +1015,12 @@ def get_sharepoint_mode() -> str:
         mode = get_sharepoint_mode()
         # Returns: {"mode": "single-site", "env_vars": [...]}
     """
+    return _sharepoint_mode_json()
+
+
+@functools.lru_cache(maxsize=1)
+def _sharepoint_mode_json() -> str:
+    """Build the get_sharepoint_mode response once (the environment is loaded at import)"""
     env_vars = {
         "SHAREPOINT_URL": "✅" if os.getenv("SHAREPOINT_URL") else "❌",
         "SHAREPOINT_SITE_URL": "✅" if os.getenv("SHAREPOINT_SITE_URL") else "❌",
@@ -883,11 +1038,11 @@ def get_sharepoint_mode() -> str:
     else:
         mode = "not configured"
     
-    return json.dumps({
+    return _json({
         "mode": mode,
         "env_vars": env_vars,
         "note": "Tools use sharepoint/utils.py for all operations"
-    }, indent=2)
+    })
 
 
 # Export the MCP server instance
@@ -919,6 +1074,9 @@ if __name__ == "__main__":
     # Get port from command line or use default
     port = int(sys.argv[1]) if len(sys.argv) > 1 else 8002
     
+    # Per-file download messages are logged at INFO; set SHAREPOINT_LOG_LEVEL=INFO to see them
+    logging.basicConfig(level=os.getenv("SHAREPOINT_LOG_LEVEL", "WARNING").upper())
+    
     print("\n" + "="*70)
     print("🚀 Starting SharePoint MCP Server")
     print("="*70)
@@ -932,5 +1090,7 @@ if __name__ == "__main__":
     print(f"   python test_sharepoint_agent_http.py")
     print("\n⏹️  Press Ctrl+C to stop\n")
     
-    # Run the server
+    # Run the server (and tell run_all_servers.py once it is listening)
+    from utility.ready_signal import notify_ready_when_listening
+    notify_ready_when_listening(port)
     mcp.run(transport='streamable-http', port=port)
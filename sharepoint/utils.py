@@ -12,15 +12,102 @@ It requires the following environment variables:
 For single-site mode, see: ingestion_workflow_clean/IngestionGraph/utils/sharepoint.py
 """
 import os
-import json
-import requests
-from typing import List, Dict, Any, Optional
+import time
+import logging
+import base64
+import asyncio
+import hashlib
+import threading
+import aiohttp
+import httpx
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import PurePosixPath
+from urllib.parse import quote, urlsplit
+from typing import List, Dict, Any, Optional, AsyncIterator, Callable, Iterator
 from datetime import datetime
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+GRAPH_BATCH_URL = "https://graph.microsoft.com/v1.0/$batch"
+
+# Microsoft Graph accepts at most 20 sub-requests per JSON batch
+GRAPH_BATCH_LIMIT = 20
+
+# Files above this size are uploaded through an upload session instead of a batch
+BATCH_UPLOAD_MAX_BYTES = 4 * 1024 * 1024
+
+# Upload session chunk size (must be a multiple of 320 KiB)
+UPLOAD_SESSION_CHUNK_BYTES = 32 * 320 * 1024
+
+# How many times throttled (429) batch sub-requests are retried
+BATCH_MAX_RETRIES = 3
+
+# Graph requests that come back throttled or with a transient server error are retried
+GRAPH_MAX_RETRIES = 3
+GRAPH_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+GRAPH_RETRY_BACKOFF = 0.3
+
+# Concurrent downloads in iter_sharepoint_downloads (bounded to avoid throttling)
+DOWNLOAD_CONCURRENCY = 8
+
+# Batch requests / upload sessions in flight at once during a bulk upload
+UPLOAD_CONCURRENCY = 4
+
+# Downloads are read and written in 1 MiB chunks (few Python iterations and syscalls per file)
+DOWNLOAD_CHUNK_BYTES = 1 << 20
+
+# Only the driveItem fields list_files reports (plus the file/folder facets)
+LIST_FILES_SELECT = "id,name,size,lastModifiedDateTime,webUrl,file,folder,@microsoft.graph.downloadUrl"
+
+# Items per page when listing a folder (Graph's maximum page size)
+LIST_FILES_PAGE_SIZE = 999
+
+# Site and drive IDs are reused for this long (a library can be deleted and recreated)
+ID_CACHE_TTL = 3600
+
+# Folder listings are reused for this long (agents often list/find/download in one turn)
+LISTING_CACHE_TTL = 30
+
+# Only the fields list_sites, list_libraries and search_content report
+LIST_SITES_SELECT = "id,displayName,webUrl,description"
+LIST_LIBRARIES_SELECT = "id,name,description,webUrl"
+SEARCH_SELECT = "name,size,lastModifiedDateTime,webUrl,file,parentReference,@microsoft.graph.downloadUrl"
+
+
+def is_pdf_name(name: str) -> bool:
+    """Check for a .pdf extension (any case) without lowercasing the whole name."""
+    return name[-4:].lower() == ".pdf"
+
+
+# Access tokens are reused until this many seconds before they expire
+TOKEN_EXPIRY_MARGIN = 60
+
+# (tenant_id, client_id) -> (access_token, expires_at), shared by every SharePointClient
+_token_cache: Dict[tuple, tuple] = {}
+_token_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _get_http_client() -> httpx.Client:
+    """
+    Get the HTTP client shared by every SharePointClient (created on first use)
+    
+    HTTP/2 multiplexes Graph requests over one pooled TLS connection, so
+    repeated calls skip the TCP and TLS handshakes.
+    """
+    return httpx.Client(
+        http2=True,
+        follow_redirects=True,
+        timeout=httpx.Timeout(60.0, connect=10.0),
+        limits=httpx.Limits(max_keepalive_connections=32)
+    )
+
 
 class SharePointClient:
     """
@@ -52,10 +139,28 @@ class SharePointClient:
             raise ValueError("Missing SharePoint credentials in environment variables")
         
         self.access_token = None
+        self._token_expires_at = 0.0
+        # site_url -> (expiry, site ID)
+        self._site_ids: Dict[str, tuple] = {}
+        # (site_url, library_name) -> (expiry, drive ID)
+        self._drive_ids: Dict[tuple, tuple] = {}
+        # (site_url, library_name, folder_path) -> (expiry, files); cleared on upload
+        self._listing_cache: Dict[tuple, tuple] = {}
+        self._http = _get_http_client()
         self._authenticate()
     
     def _authenticate(self):
-        """Authenticate with Microsoft Graph API"""
+        """Authenticate with Microsoft Graph API (reusing a cached token until it nears expiry)"""
+        key = (self.tenant_id, self.client_id)
+        with _token_lock:
+            cached = _token_cache.get(key)
+            if cached is None or cached[1] - TOKEN_EXPIRY_MARGIN <= time.time():
+                cached = self._request_token()
+                _token_cache[key] = cached
+        self.access_token, self._token_expires_at = cached
+    
+    def _request_token(self) -> tuple:
+        """Request a new access token. Returns (access_token, expires_at)."""
         token_url = f"https://login.microsoftonline.com/{self.tenant_id}/oauth2/v2.0/token"
         
         data = {
@@ -65,39 +170,68 @@ class SharePointClient:
             "grant_type": "client_credentials"
         }
         
-        response = requests.post(token_url, data=data)
+        response = self._request("POST", token_url, data=data)
         response.raise_for_status()
         
-        self.access_token = response.json()["access_token"]
+        token = orjson.loads(response.content)
+        return token["access_token"], time.time() + token.get("expires_in", 3600)
+    
+    def _request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request on the shared HTTP client, retrying throttled/transient failures
+        
+        Waits for Retry-After when Graph sends it, otherwise backs off exponentially.
+        The last response is returned either way; callers still raise_for_status.
+        """
+        for attempt in range(GRAPH_MAX_RETRIES + 1):
+            response = self._http.request(method, url, **kwargs)
+            if response.status_code not in GRAPH_RETRY_STATUSES or attempt == GRAPH_MAX_RETRIES:
+                return response
+            time.sleep(_retry_after_seconds(
+                response.headers.get("Retry-After"), GRAPH_RETRY_BACKOFF * 2 ** attempt
+            ))
     
     def _get_headers(self) -> Dict[str, str]:
         """Get authorization headers"""
+        if self._token_expires_at - TOKEN_EXPIRY_MARGIN <= time.time():
+            self._authenticate()
         return {
             "Authorization": f"Bearer {self.access_token}",
             "Content-Type": "application/json"
         }
     
     def _get_site_id(self, site_url: str) -> str:
-        """Get site ID from site URL"""
-        # Extract hostname and site path
-        parts = site_url.replace("https://", "").split("/")
-        hostname = parts[0]
-        site_path = "/".join(parts[1:]) if len(parts) > 1 else ""
+        """Get site ID from site URL (reused for ID_CACHE_TTL seconds)"""
+        cached = self._site_ids.get(site_url)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        
+        hostname, site_path = _split_site_url(site_url)
         
         # Get site by path
         url = f"https://graph.microsoft.com/v1.0/sites/{hostname}:/{site_path}"
-        response = requests.get(url, headers=self._get_headers())
+        response = self._request("GET", url, headers=self._get_headers())
         response.raise_for_status()
         
-        return response.json()["id"]
+        site_id = orjson.loads(response.content)["id"]
+        self._site_ids[site_url] = (time.monotonic() + ID_CACHE_TTL, site_id)
+        return site_id
+    
+    def _iter_values(self, url: str) -> Iterator[Dict[str, Any]]:
+        """Yield every item of a Graph collection, following @odata.nextLink across pages"""
+        while url:
+            response = self._request("GET", url, headers=self._get_headers())
+            response.raise_for_status()
+            page = orjson.loads(response.content)
+            
+            yield from page.get("value", [])
+            
+            url = page.get("@odata.nextLink")
     
     def list_sites(self) -> List[Dict[str, Any]]:
         """List all accessible SharePoint sites"""
-        url = "https://graph.microsoft.com/v1.0/sites?search=*"
-        response = requests.get(url, headers=self._get_headers())
-        response.raise_for_status()
+        url = f"https://graph.microsoft.com/v1.0/sites?search=*&$select={LIST_SITES_SELECT}"
         
-        sites = response.json().get("value", [])
         return [
             {
                 "name": site.get("displayName"),
@@ -105,18 +239,16 @@ class SharePointClient:
                 "id": site.get("id"),
                 "description": site.get("description", "")
             }
-            for site in sites
+            for site in self._iter_values(url)
         ]
     
     def list_libraries(self, site_url: str) -> List[Dict[str, Any]]:
         """List document libraries in a site"""
-        site_id = self._get_site_id(site_url)
-        url = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives"
-        
-        response = requests.get(url, headers=self._get_headers())
-        response.raise_for_status()
+        # Address the site by path so its ID doesn't have to be looked up first
+        hostname, site_path = _split_site_url(site_url)
+        site = f"{hostname}:/{site_path}:" if site_path else hostname
+        url = f"https://graph.microsoft.com/v1.0/sites/{site}/drives?$select={LIST_LIBRARIES_SELECT}"
         
-        libraries = response.json().get("value", [])
         return [
             {
                 "name": lib.get("name"),
@@ -124,7 +256,7 @@ class SharePointClient:
                 "description": lib.get("description", ""),
                 "webUrl": lib.get("webUrl")
             }
-            for lib in libraries
+            for lib in self._iter_values(url)
         ]
     
     def list_files(
@@ -133,64 +265,59 @@ class SharePointClient:
         library_name: str = "Documents",
         folder_path: str = ""
     ) -> List[Dict[str, Any]]:
-        """List files in a library or folder"""
-        site_id = self._get_site_id(site_url)
-        
-        # Get drive ID for library
-        libraries = self.list_libraries(site_url)
-        library = next((lib for lib in libraries if lib["name"] == library_name), None)
-        
-        if not library:
-            raise ValueError(f"Library '{library_name}' not found")
+        """List files in a library or folder (reused for LISTING_CACHE_TTL seconds)"""
+        key = (site_url, library_name, folder_path)
+        cached = self._listing_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return list(cached[1])
         
-        drive_id = library["id"]
+        drive_id = self._get_drive_id(site_url, library_name)
         
         # Build URL for folder or root
         if folder_path:
-            url = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives/{drive_id}/root:/{folder_path}:/children"
+            url = f"https://graph.microsoft.com/v1.0{_drive_item_ref(drive_id, folder_path)}:/children"
         else:
-            url = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives/{drive_id}/root/children"
+            url = f"https://graph.microsoft.com/v1.0/drives/{drive_id}/root/children"
+        url = f"{url}?$select={LIST_FILES_SELECT}&$top={LIST_FILES_PAGE_SIZE}"
         
-        response = requests.get(url, headers=self._get_headers())
-        response.raise_for_status()
-        
-        items = response.json().get("value", [])
-        files = []
-        
-        for item in items:
-            if "file" in item:  # It's a file, not a folder
-                files.append({
-                    "name": item.get("name"),
-                    "size": item.get("size"),
-                    "modified": item.get("lastModifiedDateTime"),
-                    "downloadUrl": item.get("@microsoft.graph.downloadUrl"),
-                    "webUrl": item.get("webUrl"),
-                    "id": item.get("id")
-                })
-        
-        return files
+        # Only files are reported, not folders
+        try:
+            files = [_listed_file(item) for item in self._iter_values(url) if "file" in item]
+        except httpx.HTTPStatusError as e:
+            # The library may have been recreated; look its drive ID up again next time
+            if e.response.status_code == 404:
+                self._drive_ids.pop((site_url, library_name), None)
+            raise
+        self._listing_cache[key] = (time.monotonic() + LISTING_CACHE_TTL, files)
+        return list(files)
     
-    def download_file(self, download_url: str, destination_path: str) -> bool:
+    def download_file(
+        self,
+        download_url: str,
+        destination_path: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> bool:
         """
         Download a file from SharePoint
         
         Args:
             download_url: Direct download URL for the file
             destination_path: Local path to save the file
+            headers: Optional request headers (needed for Graph URLs, not pre-authenticated ones)
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            response = requests.get(download_url, stream=True)
-            response.raise_for_status()
-            
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(destination_path) or ".", exist_ok=True)
-            
-            with open(destination_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            with self._http.stream("GET", download_url, headers=headers) as response:
+                response.raise_for_status()
+                
+                # Create directory if it doesn't exist
+                os.makedirs(os.path.dirname(destination_path) or ".", exist_ok=True)
+                
+                with open(destination_path, 'wb') as f:
+                    for chunk in response.iter_bytes(chunk_size=DOWNLOAD_CHUNK_BYTES):
+                        f.write(chunk)
             
             return True
         except Exception:
@@ -213,28 +340,28 @@ class SharePointClient:
         Returns:
             List of matching files with metadata
         """
+        # Escape the query as an OData string literal, then URL-encode it
+        q = quote(query.replace("'", "''"), safe="")
         if site_url:
             site_id = self._get_site_id(site_url)
-            url = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drive/root/search(q='{query}')"
+            url = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drive/root/search(q='{q}')"
         else:
-            url = f"https://graph.microsoft.com/v1.0/me/drive/root/search(q='{query}')"
+            url = f"https://graph.microsoft.com/v1.0/me/drive/root/search(q='{q}')"
+        url = f"{url}?$select={SEARCH_SELECT}"
         
-        response = requests.get(url, headers=self._get_headers())
-        response.raise_for_status()
-        
-        items = response.json().get("value", [])
         results = []
+        wanted_types = frozenset(ft.lower().strip(".") for ft in file_types) if file_types else None
         
-        for item in items:
+        for item in self._iter_values(url):
             if "file" not in item:
                 continue
                 
             file_name = item.get("name", "")
             
             # Filter by file types if specified
-            if file_types:
-                file_extension = file_name.split(".")[-1].lower() if "." in file_name else ""
-                if file_extension not in [ft.lower().strip(".") for ft in file_types]:
+            if wanted_types is not None:
+                _, dot, file_extension = file_name.rpartition(".")
+                if (file_extension.lower() if dot else "") not in wanted_types:
                     continue
             
             results.append({
@@ -267,13 +394,219 @@ class SharePointClient:
         Returns:
             File dictionary if found, None otherwise
         """
-        files = self.list_files(site_url, library_name, folder_path)
+        # Address the item by path (one request, 404 if missing) instead of listing the folder
+        drive_id = self._get_drive_id(site_url, library_name)
+        item_path = f"{folder_path.strip('/')}/{file_name}" if folder_path else file_name
+        url = f"https://graph.microsoft.com/v1.0{_drive_item_ref(drive_id, item_path)}?$select={LIST_FILES_SELECT}"
         
-        for file in files:
-            if file["name"] == file_name:
-                return file
+        response = self._request("GET", url, headers=self._get_headers())
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
         
-        return None
+        item = orjson.loads(response.content)
+        return _listed_file(item) if "file" in item else None
+    
+    def download_file_by_path(
+        self,
+        site_url: str,
+        library_name: str,
+        item_path: str,
+        destination_path: str
+    ) -> bool:
+        """
+        Download a file addressed by its path within a library
+        
+        Graph resolves the path and redirects to the content in a single request,
+        so the folder is never listed to find the file.
+        
+        Args:
+            site_url: SharePoint site URL
+            library_name: Name of the document library
+            item_path: Path of the file within the library (e.g., "Reports/2024/file.pdf")
+            destination_path: Local path to save the file
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        drive_id = self._get_drive_id(site_url, library_name)
+        url = f"https://graph.microsoft.com/v1.0{_drive_item_ref(drive_id, item_path)}:/content"
+        return self.download_file(url, destination_path, headers=self._get_headers())
+    
+    def _get_drive_id(self, site_url: str, library_name: str) -> str:
+        """Get the drive ID of a document library (reused for ID_CACHE_TTL seconds)"""
+        key = (site_url, library_name)
+        cached = self._drive_ids.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        
+        libraries = self.list_libraries(site_url)
+        library = next((lib for lib in libraries if lib["name"] == library_name), None)
+        
+        if not library:
+            raise ValueError(f"Library '{library_name}' not found")
+        
+        self._drive_ids[key] = (time.monotonic() + ID_CACHE_TTL, library["id"])
+        return library["id"]
+    
+    def _graph_batch(self, batch_requests: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Send up to GRAPH_BATCH_LIMIT requests in one Microsoft Graph $batch call
+        
+        Sub-requests throttled with 429 are retried after their Retry-After delay.
+        
+        Args:
+            batch_requests: Graph batch entries, each with a unique "id"
+            
+        Returns:
+            Dictionary mapping each request id to its sub-response
+        """
+        responses = {}
+        pending = batch_requests
+        
+        for attempt in range(BATCH_MAX_RETRIES + 1):
+            response = self._request(
+                "POST",
+                GRAPH_BATCH_URL,
+                headers=self._get_headers(),
+                content=orjson.dumps({"requests": pending})
+            )
+            response.raise_for_status()
+            
+            throttled_ids = set()
+            retry_after = 0
+            for sub_response in orjson.loads(response.content).get("responses", []):
+                responses[sub_response["id"]] = sub_response
+                if sub_response.get("status") == 429:
+                    throttled_ids.add(sub_response["id"])
+                    headers = sub_response.get("headers") or {}
+                    retry_after = max(retry_after, _retry_after_seconds(headers.get("Retry-After"), 1))
+            
+            if not throttled_ids or attempt == BATCH_MAX_RETRIES:
+                break
+            
+            time.sleep(retry_after)
+            pending = [req for req in pending if req["id"] in throttled_ids]
+        
+        return responses
+    
+    def _upload_large_file(self, drive_id: str, item_path: str, local_file_path: str) -> Dict[str, Any]:
+        """Upload a file in chunks through a Graph upload session"""
+        session_url = f"https://graph.microsoft.com/v1.0{_drive_item_ref(drive_id, item_path)}:/createUploadSession"
+        response = self._request("POST", session_url, headers=self._get_headers(), json={})
+        response.raise_for_status()
+        upload_url = orjson.loads(response.content)["uploadUrl"]
+        
+        file_size = os.path.getsize(local_file_path)
+        with open(local_file_path, 'rb') as f:
+            offset = 0
+            while offset < file_size:
+                chunk = f.read(UPLOAD_SESSION_CHUNK_BYTES)
+                end = offset + len(chunk) - 1
+                # The pre-authenticated upload URL must not receive the bearer token
+                response = self._request(
+                    "PUT",
+                    upload_url,
+                    headers={
+                        "Content-Length": str(len(chunk)),
+                        "Content-Range": f"bytes {offset}-{end}/{file_size}"
+                    },
+                    content=chunk
+                )
+                response.raise_for_status()
+                offset = end + 1
+        
+        return orjson.loads(response.content)
+    
+    def bulk_upload_files(
+        self,
+        local_files: List[str],
+        site_url: str,
+        library_name: str = "Documents",
+        folder_path: str = ""
+    ) -> List[Dict[str, Any]]:
+        """
+        Upload several files to SharePoint using Graph $batch requests
+        
+        Files up to BATCH_UPLOAD_MAX_BYTES are sent GRAPH_BATCH_LIMIT at a time in
+        a single request; larger files go through an upload session. Up to
+        UPLOAD_CONCURRENCY batches/sessions are in flight at once.
+        
+        Args:
+            local_files: Paths to local files to upload
+            site_url: SharePoint site URL
+            library_name: Name of the document library
+            folder_path: Path to folder within library
+            
+        Returns:
+            List of file information dictionaries for the successful uploads
+        """
+        drive_id = self._get_drive_id(site_url, library_name)
+        self._listing_cache.clear()
+        
+        def item_path(local_file: str) -> str:
+            file_name = os.path.basename(local_file)
+            return f"{folder_path}/{file_name}" if folder_path else file_name
+        
+        small_files = []
+        large_files = []
+        for local_file in local_files:
+            try:
+                size = os.path.getsize(local_file)
+            except OSError as e:
+                print(f"Error uploading file {local_file}: {str(e)}")
+                continue
+            (large_files if size > BATCH_UPLOAD_MAX_BYTES else small_files).append(local_file)
+        
+        def upload_group(group: List[str]) -> List[Dict[str, Any]]:
+            batch_requests = []
+            for i, local_file in enumerate(group):
+                with open(local_file, 'rb') as f:
+                    body = base64.b64encode(f.read()).decode("ascii")
+                batch_requests.append({
+                    "id": str(i),
+                    "method": "PUT",
+                    "url": f"{_drive_item_ref(drive_id, item_path(local_file))}:/content",
+                    "headers": {"Content-Type": "application/octet-stream"},
+                    "body": body
+                })
+            
+            try:
+                responses = self._graph_batch(batch_requests)
+            except Exception as e:
+                print(f"Error uploading batch: {str(e)}")
+                return []
+            
+            group_uploaded = []
+            for i, local_file in enumerate(group):
+                sub_response = responses.get(str(i), {})
+                if sub_response.get("status") in (200, 201):
+                    group_uploaded.append(_uploaded_file_info(sub_response.get("body") or {}))
+                else:
+                    print(f"Error uploading file {os.path.basename(local_file)}: HTTP {sub_response.get('status')}")
+            return group_uploaded
+        
+        def upload_large(local_file: str) -> List[Dict[str, Any]]:
+            try:
+                return [_uploaded_file_info(
+                    self._upload_large_file(drive_id, item_path(local_file), local_file)
+                )]
+            except Exception as e:
+                print(f"Error uploading file {os.path.basename(local_file)}: {str(e)}")
+                return []
+        
+        groups = [small_files[start:start + GRAPH_BATCH_LIMIT] for start in range(0, len(small_files), GRAPH_BATCH_LIMIT)]
+        
+        # Batches and upload sessions are independent, so several run at once
+        with ThreadPoolExecutor(max_workers=UPLOAD_CONCURRENCY) as pool:
+            group_results = pool.map(upload_group, groups)
+            large_results = pool.map(upload_large, large_files)
+            return [
+                file_info
+                for results in (group_results, large_results)
+                for result in results
+                for file_info in result
+            ]
     
     def upload_file(
         self,
@@ -297,52 +630,95 @@ class SharePointClient:
             File information dictionary if successful, None otherwise
         """
         try:
-            site_id = self._get_site_id(site_url)
-            
-            # Get drive ID for library
-            libraries = self.list_libraries(site_url)
-            library = next((lib for lib in libraries if lib["name"] == library_name), None)
-            
-            if not library:
-                raise ValueError(f"Library '{library_name}' not found")
-            
-            drive_id = library["id"]
+            drive_id = self._get_drive_id(site_url, library_name)
+            self._listing_cache.clear()
             
             # Use local filename if remote name not provided
             if not remote_file_name:
                 remote_file_name = os.path.basename(local_file_path)
             
-            # Build upload URL
-            if folder_path:
-                upload_url = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives/{drive_id}/root:/{folder_path}/{remote_file_name}:/content"
-            else:
-                upload_url = f"https://graph.microsoft.com/v1.0/sites/{site_id}/drives/{drive_id}/root:/{remote_file_name}:/content"
+            item_path = f"{folder_path}/{remote_file_name}" if folder_path else remote_file_name
             
-            # Read file content
-            with open(local_file_path, 'rb') as f:
-                file_content = f.read()
+            # Simple PUTs are limited in size; larger files go up in chunks through a session
+            if os.path.getsize(local_file_path) > BATCH_UPLOAD_MAX_BYTES:
+                return _uploaded_file_info(self._upload_large_file(drive_id, item_path, local_file_path))
+            
+            upload_url = f"https://graph.microsoft.com/v1.0{_drive_item_ref(drive_id, item_path)}:/content"
             
-            # Upload file
+            # The body is at most BATCH_UPLOAD_MAX_BYTES, so it is read up front to be resendable on retry
             headers = self._get_headers()
             headers["Content-Type"] = "application/octet-stream"
             
-            response = requests.put(upload_url, headers=headers, data=file_content)
+            with open(local_file_path, 'rb') as f:
+                content = f.read()
+            response = self._request("PUT", upload_url, headers=headers, content=content)
             response.raise_for_status()
             
-            file_info = response.json()
-            return {
-                "name": file_info.get("name"),
-                "id": file_info.get("id"),
-                "size": file_info.get("size"),
-                "webUrl": file_info.get("webUrl"),
-                "modified": file_info.get("lastModifiedDateTime")
-            }
+            return _uploaded_file_info(orjson.loads(response.content))
             
         except Exception as e:
             print(f"Error uploading file: {str(e)}")
             return None
 
 
+def _split_site_url(site_url: str) -> tuple:
+    """Split a site URL into (hostname, site path without surrounding slashes)"""
+    parts = urlsplit(site_url if "://" in site_url else f"https://{site_url}")
+    return parts.netloc, parts.path.strip("/")
+
+
+def _retry_after_seconds(retry_after: Optional[str], default: float) -> float:
+    """Delay given by a Retry-After header in seconds form (HTTP dates and junk fall back to default)"""
+    return int(retry_after) if retry_after and retry_after.isdigit() else default
+
+
+def _drive_item_ref(drive_id: str, item_path: str) -> str:
+    """Graph path of a drive item addressed by its path in the library (percent-encoded, so '#' and '?' are safe)"""
+    return f"/drives/{drive_id}/root:/{quote(item_path.strip('/'))}"
+
+
+def _listed_file(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Pick the fields reported for a file out of a Graph driveItem (as returned by list_files)"""
+    return {
+        "name": item.get("name"),
+        "size": item.get("size"),
+        "modified": item.get("lastModifiedDateTime"),
+        "downloadUrl": item.get("@microsoft.graph.downloadUrl"),
+        "webUrl": item.get("webUrl"),
+        "id": item.get("id")
+    }
+
+
+def _uploaded_file_info(file_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Pick the fields reported for an uploaded file out of a Graph driveItem"""
+    return {
+        "name": file_info.get("name"),
+        "id": file_info.get("id"),
+        "size": file_info.get("size"),
+        "webUrl": file_info.get("webUrl"),
+        "modified": file_info.get("lastModifiedDateTime")
+    }
+
+
+@lru_cache(maxsize=1)
+def get_sharepoint_client() -> SharePointClient:
+    """Get the process-wide SharePointClient (created on first use; refreshes its own token)"""
+    return SharePointClient()
+
+
+# How long find_sharepoint_file trusts file info recorded by an upload
+FILE_INFO_CACHE_TTL = 5 * 60
+
+# (library_name, folder_path, file name) -> (expiry, file info), written through on upload
+_file_info_cache: Dict[tuple, tuple] = {}
+
+
+def _remember_uploaded_file(library_name: str, folder_path: str, file_info: Dict[str, Any]) -> None:
+    """Cache an uploaded file's info so find_sharepoint_file can answer without Graph"""
+    key = (library_name, folder_path.strip("/"), file_info.get("name"))
+    _file_info_cache[key] = (time.monotonic() + FILE_INFO_CACHE_TTL, file_info)
+
+
 # Utility functions for MCP tools (single-site compatibility mode)
 def list_sharepoint_files(library_name: str = "Documents", folder_path: str = "") -> List[Dict[str, Any]]:
     """
@@ -350,7 +726,7 @@ def list_sharepoint_files(library_name: str = "Documents", folder_path: str = ""
     Uses SHAREPOINT_SITE_URL from environment
     """
     try:
-        client = SharePointClient()
+        client = get_sharepoint_client()
         if not client.site_url:
             raise ValueError("SHAREPOINT_SITE_URL or SHAREPOINT_URL not set in environment")
         
@@ -380,27 +756,21 @@ def download_specific_sharepoint_file(
         Local file path if successful, None otherwise
     """
     try:
-        client = SharePointClient()
+        client = get_sharepoint_client()
         if not client.site_url:
             raise ValueError("SHAREPOINT_SITE_URL or SHAREPOINT_URL not set in environment")
         
-        # Find the file
-        file_info = client.find_file_by_name(file_name, client.site_url, library_name, folder_path)
-        
-        if not file_info:
-            print(f"File '{file_name}' not found")
-            return None
-        
         # Create local folder
         os.makedirs(local_folder, exist_ok=True)
         local_path = os.path.join(local_folder, file_name)
         
-        # Download the file
-        if client.download_file(file_info["downloadUrl"], local_path):
-            print(f"Downloaded: {file_name} -> {local_path}")
+        # Fetch the file by its path instead of listing the folder to find it
+        item_path = f"{folder_path.strip('/')}/{file_name}" if folder_path else file_name
+        if client.download_file_by_path(client.site_url, library_name, item_path, local_path):
+            logger.info("Downloaded: %s -> %s", file_name, local_path)
             return local_path
         else:
-            print(f"Failed to download: {file_name}")
+            logger.warning("Failed to download: %s", file_name)
             return None
             
     except Exception as e:
@@ -408,6 +778,119 @@ def download_specific_sharepoint_file(
         return None
 
 
+async def _download_one(
+    session: aiohttp.ClientSession,
+    semaphore: asyncio.Semaphore,
+    download_url: str,
+    destination_path: str,
+    hasher: Optional[Any] = None
+) -> None:
+    """Stream one file from its pre-authenticated download URL to destination_path (feeding hasher if given)"""
+    async with semaphore:
+        async with session.get(download_url) as response:
+            response.raise_for_status()
+            f = await asyncio.to_thread(open, destination_path, 'wb')
+            
+            def write_chunk(chunk: bytes) -> None:
+                f.write(chunk)
+                if hasher is not None:
+                    hasher.update(chunk)
+            
+            try:
+                try:
+                    # Disk writes and hashing run off the event loop so other downloads keep flowing
+                    async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_BYTES):
+                        await asyncio.to_thread(write_chunk, chunk)
+                finally:
+                    await asyncio.to_thread(f.close)
+            except BaseException:
+                # A stream that failed part-way must not leave a truncated file behind
+                try:
+                    os.unlink(destination_path)
+                except FileNotFoundError:
+                    pass
+                raise
+
+
+def sharepoint_item_digest(file_info: Dict[str, Any]) -> bytes:
+    """Digest of a file's SharePoint id, size and modification time (changes whenever the file does)"""
+    key = f"sharepoint:{file_info.get('id')}:{file_info.get('size')}:{file_info.get('modified')}"
+    return hashlib.sha256(key.encode("utf-8")).digest()
+
+
+async def iter_sharepoint_downloads(
+    file_names: Optional[List[str]] = None,
+    library_name: str = "Documents",
+    folder_path: str = "",
+    local_folder: str = "downloaded_files",
+    skip: Optional[Callable[[bytes], bool]] = None,
+    content_hasher: Optional[Callable[[], Any]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Download files from SharePoint concurrently, yielding each as it finishes (single-site mode)
+    
+    The folder is listed once, then up to DOWNLOAD_CONCURRENCY files are fetched
+    at a time over one aiohttp session.
+    
+    Args:
+        file_names: Names of the files to download (None downloads every PDF in the folder)
+        library_name: Document library name
+        folder_path: Folder path within library
+        local_folder: Local folder to save files
+        skip: Optional predicate on sharepoint_item_digest; matching files are not downloaded
+        content_hasher: Optional hasher factory; each download is hashed while it is written
+        
+    Yields:
+        Dictionaries with file_name, local_path (None if the download failed or was
+        skipped), digest, content_digest (None without content_hasher) and skipped,
+        in completion order
+    """
+    client = await asyncio.to_thread(get_sharepoint_client)
+    if not client.site_url:
+        raise ValueError("SHAREPOINT_SITE_URL or SHAREPOINT_URL not set in environment")
+    
+    files = await asyncio.to_thread(client.list_files, client.site_url, library_name, folder_path)
+    files_by_name = {file["name"]: file for file in files}
+    
+    if file_names is None:
+        file_names = [name for name in files_by_name if is_pdf_name(name)]
+    
+    os.makedirs(local_folder, exist_ok=True)
+    semaphore = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+    
+    async with aiohttp.ClientSession() as session:
+        async def fetch(file_name: str) -> Dict[str, Any]:
+            result = {
+                "file_name": file_name, "local_path": None,
+                "digest": None, "content_digest": None, "skipped": False
+            }
+            local_path = os.path.join(local_folder, file_name)
+            try:
+                file_info = files_by_name.get(file_name)
+                if not file_info:
+                    raise FileNotFoundError(f"File '{file_name}' not found")
+                
+                result["digest"] = sharepoint_item_digest(file_info)
+                if skip and await asyncio.to_thread(skip, result["digest"]):
+                    result["skipped"] = True
+                    return result
+                
+                hasher = content_hasher() if content_hasher else None
+                await _download_one(session, semaphore, file_info["downloadUrl"], local_path, hasher)
+                if hasher is not None:
+                    result["content_digest"] = hasher.digest()
+            except Exception as e:
+                logger.warning("Failed to download: %s - %s", file_name, e)
+                return result
+            
+            logger.info("Downloaded: %s -> %s", file_name, local_path)
+            result["local_path"] = local_path
+            return result
+        
+        for next_done in asyncio.as_completed([fetch(file_name) for file_name in file_names]):
+            yield await next_done
+
+
 def download_pdfs_from_sharepoint(
     library_name: str = "Documents",
     folder_path: str = "",
@@ -425,7 +908,7 @@ def download_pdfs_from_sharepoint(
         List of local file paths for downloaded PDFs
     """
     try:
-        client = SharePointClient()
+        client = get_sharepoint_client()
         if not client.site_url:
             raise ValueError("SHAREPOINT_SITE_URL or SHAREPOINT_URL not set in environment")
         
@@ -436,27 +919,28 @@ def download_pdfs_from_sharepoint(
         files = client.list_files(client.site_url, library_name, folder_path)
         
         # Filter PDF files
-        pdf_files = [f for f in files if f["name"].lower().endswith('.pdf')]
+        pdf_files = [f for f in files if is_pdf_name(f["name"])]
         
         if not pdf_files:
-            print("No PDF files found")
+            logger.info("No PDF files found")
             return []
         
-        downloaded_files = []
-        
-        for file in pdf_files:
+        def fetch(file: Dict[str, Any]) -> Optional[str]:
             file_name = file["name"]
             local_path = os.path.join(local_folder, file_name)
             
-            print(f"Downloading: {file_name}")
-            
             if client.download_file(file["downloadUrl"], local_path):
-                downloaded_files.append(local_path)
-                print(f"Successfully downloaded: {file_name}")
-            else:
-                print(f"Failed to download: {file_name}")
+                logger.info("Successfully downloaded: %s", file_name)
+                return local_path
+            logger.warning("Failed to download: %s", file_name)
+            return None
+        
+        # Downloads are network-bound, so overlap them on the shared HTTP client
+        logger.info("Downloading %d PDF file(s)...", len(pdf_files))
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_CONCURRENCY) as pool:
+            results = list(pool.map(fetch, pdf_files))
         
-        return downloaded_files
+        return [local_path for local_path in results if local_path]
         
     except Exception as e:
         print(f"Error downloading PDFs: {str(e)}")
@@ -481,12 +965,9 @@ def download_file_by_sharepoint_path(
     """
     try:
         # Split path into folder and filename
-        parts = file_path.rsplit('/', 1)
-        if len(parts) == 2:
-            folder_path, file_name = parts
-        else:
-            folder_path = ""
-            file_name = parts[0]
+        path = PurePosixPath(file_path)
+        folder_path = "" if str(path.parent) in (".", "/") else str(path.parent)
+        file_name = path.name
         
         # If no local path specified, use current directory
         if not local_path:
@@ -531,17 +1012,20 @@ def upload_file_to_sharepoint(
         File information dictionary if successful, None otherwise
     """
     try:
-        client = SharePointClient()
+        client = get_sharepoint_client()
         if not client.site_url:
             raise ValueError("SHAREPOINT_SITE_URL or SHAREPOINT_URL not set in environment")
         
-        return client.upload_file(
+        file_info = client.upload_file(
             local_file_path,
             client.site_url,
             library_name,
             folder_path,
             remote_file_name
         )
+        if file_info:
+            _remember_uploaded_file(library_name, folder_path, file_info)
+        return file_info
         
     except Exception as e:
         print(f"Error uploading file: {str(e)}")
@@ -564,25 +1048,28 @@ def bulk_upload_to_sharepoint(
     Returns:
         List of successfully uploaded file information dictionaries
     """
-    uploaded_files = []
-    
     print(f"Starting bulk upload of {len(local_files)} file(s)...")
     
-    for i, local_file in enumerate(local_files, 1):
-        print(f"\n[{i}/{len(local_files)}] Uploading: {os.path.basename(local_file)}")
-        
-        file_info = upload_file_to_sharepoint(local_file, library_name, folder_path)
+    try:
+        client = get_sharepoint_client()
+        if not client.site_url:
+            raise ValueError("SHAREPOINT_SITE_URL or SHAREPOINT_URL not set in environment")
         
-        if file_info:
-            uploaded_files.append(file_info)
-            print(f"   ✅ Success")
-        else:
-            print(f"   ❌ Failed")
+        # Small files go up GRAPH_BATCH_LIMIT per request instead of one request each
+        uploaded_files = client.bulk_upload_files(local_files, client.site_url, library_name, folder_path)
+        for file_info in uploaded_files:
+            _remember_uploaded_file(library_name, folder_path, file_info)
+    except Exception as e:
+        print(f"Error uploading files: {str(e)}")
+        uploaded_files = []
     
-    print(f"\n📊 Upload Summary:")
-    print(f"   Total: {len(local_files)} files")
-    print(f"   Successful: {len(uploaded_files)} files")
-    print(f"   Failed: {len(local_files) - len(uploaded_files)} files")
+    # One write for the whole summary block
+    print(
+        f"\n📊 Upload Summary:\n"
+        f"   Total: {len(local_files)} files\n"
+        f"   Successful: {len(uploaded_files)} files\n"
+        f"   Failed: {len(local_files) - len(uploaded_files)} files"
+    )
     
     return uploaded_files
 
@@ -603,8 +1090,13 @@ def find_sharepoint_file(
     Returns:
         File information dictionary or None if not found
     """
+    # Files uploaded through this module are answered from the write-through cache
+    cached = _file_info_cache.get((library_name, folder_path.strip("/"), file_name))
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+    
     try:
-        client = SharePointClient()
+        client = get_sharepoint_client()
         if not client.site_url:
             raise ValueError("SHAREPOINT_SITE_URL or SHAREPOINT_URL not set in environment")
         
@@ -623,7 +1115,7 @@ def test_sharepoint_connection() -> Dict[str, Any]:
         Dictionary with connection status and available libraries
     """
     try:
-        client = SharePointClient()
+        client = get_sharepoint_client()
         if not client.site_url:
             return {"error": "SHAREPOINT_SITE_URL or SHAREPOINT_URL not set in environment"}
         
@@ -643,30 +1135,35 @@ def test_sharepoint_connection() -> Dict[str, Any]:
         }
 
 
+def _json(obj: Any, indent: bool = True) -> str:
+    """Serialize a helper's result to a JSON string with orjson"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+
+
 # Multi-site utility functions for MCP tools
 def list_sharepoint_sites() -> str:
     """List all SharePoint sites"""
     try:
-        client = SharePointClient()
+        client = get_sharepoint_client()
         sites = client.list_sites()
-        return json.dumps(sites, indent=2)
+        return _json(sites)
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return _json({"error": str(e)}, indent=False)
 
 
 def list_sharepoint_libraries(site_url: Optional[str] = None) -> str:
     """List libraries in a SharePoint site"""
     try:
-        client = SharePointClient()
+        client = get_sharepoint_client()
         if not site_url:
             site_url = client.site_url
         if not site_url:
-            return json.dumps({"error": "No site URL provided"})
+            return _json({"error": "No site URL provided"}, indent=False)
         
         libraries = client.list_libraries(site_url)
-        return json.dumps(libraries, indent=2)
+        return _json(libraries)
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return _json({"error": str(e)}, indent=False)
 
 
 def search_sharepoint_content(
@@ -676,8 +1173,8 @@ def search_sharepoint_content(
 ) -> str:
     """Search SharePoint content"""
     try:
-        client = SharePointClient()
+        client = get_sharepoint_client()
         results = client.search_content(query, site_url, file_types)
-        return json.dumps(results, indent=2)
+        return _json(results)
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return _json({"error": str(e)}, indent=False)
@@ -0,0 +1,24 @@
+"""
+Shared async HTTP client.
+
+One pooled httpx.AsyncClient per event loop, reused by the agents for LLM API
+calls and MCP server health checks so connections are kept alive between calls.
+A client's connections belong to the loop that opened them, so each loop (for
+example each asyncio.run) gets its own.
+"""
+import asyncio
+import weakref
+import httpx
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the httpx.AsyncClient for the running event loop (created on first use in that loop)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+        )
+    return client
@@ -0,0 +1,132 @@
+"""
+Persistent cache of already-ingested PDFs, keyed by a hash of the file bytes
+and the vector store collection it went into.
+
+Lets ingestion skip a PDF before it is opened and parsed when the exact same
+file has already been pushed into the vector stores. Recreating a collection
+(flush.py) must call forget_collection so its files are ingested again.
+"""
+import os
+import mmap
+import time
+import sqlite3
+import hashlib
+from functools import lru_cache
+from typing import Optional, Sequence
+
+try:
+    import blake3
+except ImportError:  # blake3 is optional; hashlib.blake2b is the fallback
+    blake3 = None
+
+CACHE_DB_PATH = os.getenv(
+    "INGEST_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "ingest_cache.db")
+)
+
+# Collections process_pdf_and_stream writes to (see vector_store/load_dbs.py);
+# a file only counts as ingested once it is recorded for all of them
+INGEST_COLLECTIONS = ("10K_vector_db", "multimodel_vector_db")
+
+# Bumped when the table layout changes; older tables are dropped and rebuilt
+SCHEMA_VERSION = 1
+
+
+def _connect() -> sqlite3.Connection:
+    """Open the cache database, creating (or rebuilding an outdated) table on first use."""
+    conn = sqlite3.connect(CACHE_DB_PATH)
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        with conn:
+            # Rows without a collection can't be invalidated by a flush, so they are not kept
+            conn.execute("DROP TABLE IF EXISTS ingested")
+            conn.execute(
+                "CREATE TABLE ingested("
+                "hash BLOB, collection TEXT, path TEXT, doc_id TEXT, ts REAL, "
+                "PRIMARY KEY (hash, collection))"
+            )
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    return conn
+
+
+def new_hasher():
+    """Create the content hasher used for cache keys (feed it bytes, then call digest())."""
+    return blake3.blake3() if blake3 is not None else hashlib.blake2b()
+
+
+@lru_cache(maxsize=1024)
+def _hash_file(path: str, mtime_ns: int, size: int) -> bytes:
+    """Hash the file bytes via mmap (mtime/size are part of the cache key)."""
+    hasher = new_hasher()
+    if size:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            hasher.update(mm)
+    return hasher.digest()
+
+
+def file_hash(path: str, st: Optional[os.stat_result] = None) -> bytes:
+    """Get the content hash of a file (pass st to reuse an existing stat)."""
+    if st is None:
+        st = os.stat(path)
+    return _hash_file(os.fspath(path), st.st_mtime_ns, st.st_size)
+
+
+def seen(
+    path: str,
+    st: Optional[os.stat_result] = None,
+    collections: Sequence[str] = INGEST_COLLECTIONS
+) -> bool:
+    """Check whether a file with identical content has already been ingested into collections."""
+    return seen_digest(file_hash(path, st), collections)
+
+
+def mark(
+    path: str,
+    doc_id: Optional[str] = None,
+    st: Optional[os.stat_result] = None,
+    collections: Sequence[str] = INGEST_COLLECTIONS
+) -> None:
+    """Record a file as ingested into collections."""
+    mark_digest(file_hash(path, st), os.fspath(path), doc_id, collections)
+
+
+def seen_digest(digest: bytes, collections: Sequence[str] = INGEST_COLLECTIONS) -> bool:
+    """Check whether a digest (of file content or remote metadata) is recorded for every collection."""
+    placeholders = ",".join("?" * len(collections))
+    conn = _connect()
+    try:
+        (count,) = conn.execute(
+            f"SELECT COUNT(*) FROM ingested WHERE hash = ? AND collection IN ({placeholders})",
+            (digest, *collections)
+        ).fetchone()
+    finally:
+        conn.close()
+    return count == len(set(collections))
+
+
+def mark_digest(
+    digest: bytes,
+    path: str,
+    doc_id: Optional[str] = None,
+    collections: Sequence[str] = INGEST_COLLECTIONS
+) -> None:
+    """Record a digest as ingested into collections."""
+    now = time.time()
+    conn = _connect()
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO ingested(hash, collection, path, doc_id, ts) VALUES (?, ?, ?, ?, ?)",
+                [(digest, collection, path, doc_id, now) for collection in collections]
+            )
+    finally:
+        conn.close()
+
+
+def forget_collection(collection: str) -> int:
+    """Drop every record for a collection (call after it is recreated). Returns the rows removed."""
+    conn = _connect()
+    try:
+        with conn:
+            return conn.execute("DELETE FROM ingested WHERE collection = ?", (collection,)).rowcount
+    finally:
+        conn.close()
@@ -13,6 +13,9 @@ from langchain_openai import OpenAIEmbeddings
 from vector_store.load_dbs import load_vector_database
 from data_preparation.image_data_prep import ImageDescription
 
+# Number of points sent to Qdrant per upsert call during ingestion
+UPSERT_BATCH_SIZE = int(os.getenv("QDRANT_UPSERT_BATCH_SIZE", "256"))
+
 
 def init_vector_stores():
     """Initialize and return text and image vector stores with proper collection setup."""
@@ -323,23 +326,7 @@ def process_pdf_and_stream(uploaded_pdf_path: str):
                 print("\nDebug: Adding text chunks to Qdrant")
                 print(f"First chunk metadata sample: {text_chunks[0].metadata}")
                 print(f"First chunk ID: {ids[0]}")
-                text_vectorstore.add_documents(text_chunks, ids=ids)
-                print("Debug: Verifying ingestion...")
-                verify_points = text_vectorstore.client.scroll(
-                    collection_name=text_vectorstore.collection_name,
-                    scroll_filter=models.Filter(
-                        must=[
-                            models.FieldCondition(
-                                key="metadata.source_file",
-                                match=models.MatchValue(value=source_file_name)
-                            )
-                        ]
-                    ),
-                    with_payload=True,
-                    limit=1
-                )[0]
-                if verify_points:
-                    print(f"Verification - First point payload: {verify_points[0].payload}")
+                text_vectorstore.add_documents(text_chunks, ids=ids, batch_size=UPSERT_BATCH_SIZE)
                 yield f"Added {len(text_chunks)} text chunks from {source_file_name} into Qdrant text vector store."
             else:
                 yield "No text extracted from PDF."
@@ -404,7 +391,7 @@ def process_pdf_and_stream(uploaded_pdf_path: str):
 
                 # Generate deterministic UUIDs using the common function
                 img_ids = [generate_doc_id(doc.metadata, i, "image") for i, doc in enumerate(image_documents)]
-                image_vectorstore.add_documents(image_documents, ids=img_ids)
+                image_vectorstore.add_documents(image_documents, ids=img_ids, batch_size=UPSERT_BATCH_SIZE)
                 yield f"Added {len(image_documents)} image captions from {source_file_name} into Qdrant image vector store."
             else:
                 yield "No images found in PDF."
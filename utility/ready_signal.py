@@ -0,0 +1,37 @@
+"""
+Readiness handshake between run_all_servers.py and the servers it launches.
+
+The runner passes the write end of a pipe in MCP_READY_FD; once the server's
+port accepts connections the child writes one byte to it, so the runner can
+wait on the pipes instead of polling every port itself.
+"""
+import os
+import socket
+import threading
+import time
+
+READY_FD_ENV = "MCP_READY_FD"
+
+
+def notify_ready_when_listening(port: int, host: str = "127.0.0.1", timeout: float = 60) -> None:
+    """Signal the runner once port is listening (no-op when not launched by run_all_servers)."""
+    ready_fd = os.environ.pop(READY_FD_ENV, None)
+    if ready_fd is None:
+        return
+
+    def _watch():
+        fd = int(ready_fd)
+        deadline = time.monotonic() + timeout
+        try:
+            # Loopback connects are cheap, so check often and report almost immediately
+            while time.monotonic() < deadline:
+                try:
+                    with socket.create_connection((host, port), timeout=0.1):
+                        os.write(fd, b"1")
+                        return
+                except OSError:
+                    time.sleep(0.01)
+        finally:
+            os.close(fd)
+
+    threading.Thread(target=_watch, name="ready-signal", daemon=True).start()
@@ -0,0 +1,29 @@
+"""
+Async readiness check for the MCP servers.
+
+Shared by the agents so they can wait for a server without blocking the event loop.
+"""
+import asyncio
+from urllib.parse import urlparse
+
+
+async def wait_for_server(url: str, timeout: int = 10):
+    """Wait until the server at url accepts TCP connections (backs off from 25ms to 0.5s)."""
+    parsed = urlparse(url)
+    host = parsed.hostname or 'localhost'
+    port = parsed.port
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    delay = 0.025
+    while loop.time() < deadline:
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=0.5)
+            writer.close()
+            await writer.wait_closed()
+            print(f"✅ MCP server is up at {url}")
+            return True
+        except (OSError, asyncio.TimeoutError):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.5)
+    raise TimeoutError(f"MCP server at {url} did not respond within {timeout} seconds")
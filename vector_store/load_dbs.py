@@ -2,6 +2,7 @@
 this module is used for loading the image related data and vector db retriever
 """
 
+import os
 from dotenv import load_dotenv
 from langchain_openai import OpenAIEmbeddings
 from langchain_qdrant import QdrantVectorStore  # Updated LangChain Qdrant integration
@@ -17,7 +18,12 @@ class load_vector_database():
         self.image_vector_db_path = "multimodel_vector_db"  # collection name
         self.text_vector_db_path = "10K_vector_db"          # collection name
         self.embeddings = OpenAIEmbeddings()
-        self.qdrant_client = QdrantClient(url="http://localhost:6333")
+        # gRPC is much cheaper than REST/JSON for bulk upserts; opt in with QDRANT_PREFER_GRPC=1
+        self.qdrant_client = QdrantClient(
+            url="http://localhost:6333",
+            prefer_grpc=os.getenv("QDRANT_PREFER_GRPC", "").lower() in ("1", "true", "yes"),
+            grpc_port=int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+        )
     
     def get_image_retriever(self):
         image_vectorstore_10k = QdrantVectorStore(